@@ -0,0 +1,31 @@
+"""Общая настройка Django для бенчмарков.
+
+Бенчмарки работают с отдельной SQLite-базой, чтобы не трогать
+db.sqlite3 разработчика.
+"""
+import os
+import sys
+import tempfile
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'yatube'
+)
+
+
+def setup_django(db_path=None, migrate=True):
+    """Настраивает Django на базу db_path и применяет миграции."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = db_path
+    django.setup()
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+    return db_path
@@ -0,0 +1,65 @@
+"""Байты на проводе и цена сжатия страницы index из 10 постов.
+
+    python benchmarks/compression.py --repeat 200
+
+Страница отрисовывается через тестовый клиент Django без сжатия, затем
+тело сжимается gzip с уровнями 1, 6 и 9 и, если установлен пакет
+brotli, brotli с качеством 1, 5 и 11. Для каждого варианта выводится
+размер, доля от исходного и процессорное время на одно сжатие.
+"""
+import argparse
+import time
+
+from common import setup_django
+
+POSTS = 10
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 5, 11)
+
+
+def render_index():
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    with override_settings(COMPRESSION_MIN_SIZE=float('inf')):
+        response = Client().get(reverse('posts:index'))
+    return response.content
+
+
+def cpu_time(function, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        function()
+    return (time.process_time() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from core import compression
+    from posts import seeding
+
+    seeding.seed(POSTS, authors=3, groups=2)
+    body = render_index()
+    variants = [('gzip', level) for level in GZIP_LEVELS]
+    if compression.brotli is not None:
+        variants += [('br', quality) for quality in BROTLI_QUALITIES]
+    else:
+        print('brotli не установлен, сравнивается только gzip')
+
+    print(f'{"кодировка":<12}{"байт":>8}{"доля":>8}{"мкс":>10}')
+    print(f'{"identity":<12}{len(body):>8}{1:>8.0%}{0:>10.0f}')
+    for encoding, level in variants:
+        size = len(compression.compress(body, encoding, level))
+        seconds = cpu_time(
+            lambda: compression.compress(body, encoding, level), args.repeat
+        )
+        print(f'{f"{encoding}-{level}":<12}{size:>8}'
+              f'{size / len(body):>8.0%}{seconds * 1e6:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Планы запросов лент до и после индексов на большой таблице.
+
+    python benchmarks/query_plans.py --rows 1000000
+
+Скрипт наполняет временную базу постами, печатает
+EXPLAIN QUERY PLAN и время запросов index, group_posts и profile
+с индексами из posts.Post.Meta.indexes и без них.
+"""
+import argparse
+import time
+
+from common import setup_django
+
+
+def feed_querysets():
+    from posts.models import Post
+
+    return {
+        'index': Post.objects.for_feed(),
+        'group_posts': Post.objects.for_feed().filter(group_id=1),
+        'profile': Post.objects.for_feed().filter(author_id=1),
+    }
+
+
+def report(title):
+    from django.db import connection
+
+    print(f'\n== {title}')
+    for name, queryset in feed_querysets().items():
+        sql, params = queryset[:10].query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = [row[-1] for row in cursor.fetchall()]
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            elapsed = (time.perf_counter() - started) * 1000
+        print(f'{name}: {elapsed:.1f} ms')
+        for line in plan:
+            print(f'    {line}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--authors', type=int, default=1_000)
+    parser.add_argument('--groups', type=int, default=100)
+    parser.add_argument('--db', help='путь к SQLite-базе (по умолчанию tmp)')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.db import connection
+    from posts import seeding
+    from posts.models import Post
+
+    started = time.perf_counter()
+    seeding.seed(args.rows, args.authors, args.groups,
+                 author_skew=1, group_skew=1)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    print(f'Засеяно {args.rows} постов за '
+          f'{time.perf_counter() - started:.1f} с')
+
+    report('С индексами')
+    with connection.schema_editor() as editor:
+        for index in Post._meta.indexes:
+            editor.remove_index(Post, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    report('Без индексов')
+
+
+if __name__ == '__main__':
+    main()
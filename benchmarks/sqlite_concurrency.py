@@ -0,0 +1,113 @@
+"""Параллельные чтение и запись в SQLite до и после настроек продакшена.
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 2
+
+"До" — настройки по умолчанию: журнал отката и новое соединение на
+каждую операцию, как без CONN_MAX_AGE. "После" — SQLITE_PRAGMAS и
+постоянные соединения из yatube.settings_production. Оба прогона идут
+на копиях одной засеянной базы.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from common import setup_django
+
+
+def copy_database(source, target):
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+def worker(operation, persistent, deadline, totals, lock):
+    from django.db import OperationalError, connection
+
+    done = errors = 0
+    while time.perf_counter() < deadline:
+        try:
+            operation()
+            done += 1
+        except OperationalError:
+            # database is locked: писатель не дождался блокировки
+            errors += 1
+        if not persistent:
+            connection.close()
+    connection.close()
+    with lock:
+        totals['ops'] += done
+        totals['errors'] += errors
+
+
+def run(path, pragmas, persistent, args):
+    from django.conf import settings
+    from django.db import connection
+    from posts.models import Post, User
+
+    connection.close()
+    settings.DATABASES['default']['NAME'] = path
+    settings.SQLITE_PRAGMAS = pragmas
+    author = User.objects.first()
+    connection.close()
+
+    def read():
+        list(Post.objects.for_feed()[:10])
+
+    def write():
+        Post.objects.create(author=author, text='Пост из бенчмарка')
+
+    results = {}
+    lock = threading.Lock()
+    counts = {'читатели': (read, args.readers),
+              'писатели': (write, args.writers)}
+    totals = {name: {'ops': 0, 'errors': 0} for name in counts}
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(
+            operation, persistent, deadline, totals[name], lock))
+        for name, (operation, number) in counts.items()
+        for _ in range(number)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for name, total in totals.items():
+        results[name] = (total['ops'] / args.seconds, total['errors'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--posts', type=int, default=20_000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    seeded = setup_django(os.path.join(directory, 'seed.sqlite3'))
+    from django.db import connection
+    from posts import seeding
+    from yatube.settings_production import SQLITE_PRAGMAS
+
+    seeding.seed(args.posts, authors=100, groups=20)
+    connection.close()
+
+    for title, pragmas, persistent in (
+        ('До', {}, False),
+        ('После', SQLITE_PRAGMAS, True),
+    ):
+        path = os.path.join(directory, f'{title}.sqlite3')
+        copy_database(seeded, path)
+        results = run(path, pragmas, persistent, args)
+        print(f'\n== {title}')
+        for name, (rate, errors) in results.items():
+            print(f'{name}: {rate:.0f} операций/с, ошибок блокировки: '
+                  f'{errors}')
+
+
+if __name__ == '__main__':
+    main()
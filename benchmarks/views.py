@@ -0,0 +1,249 @@
+"""Пропускная способность и задержки страниц постов.
+
+    python benchmarks/views.py --posts 100000 --authors 2000 --groups 1000
+    python benchmarks/views.py --compare benchmarks/results/<commit>.json
+
+Скрипт наполняет временную базу через posts.seeding и гоняет
+index, group_posts, profile, post_detail и post_create через тестовый
+клиент Django и через локальный WSGI-сервер. Итог (запросов в секунду,
+p50 и p99 в миллисекундах) пишется в JSON рядом с id коммита, чтобы
+сравнивать прогоны между коммитами.
+"""
+import argparse
+import json
+import os
+import subprocess
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from common import setup_django
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'results')
+USERNAME = 'bench'
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def summarize(timings):
+    total = sum(timings)
+    return {
+        'requests': len(timings),
+        'rps': round(len(timings) / total, 1),
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 2),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 2),
+    }
+
+
+def measure(send, requests, warmup):
+    for _ in range(warmup):
+        send()
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        send()
+        timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+def targets():
+    """Имя сценария -> (метод, адрес, данные формы)."""
+    from django.urls import reverse
+    from posts.models import Group, Post, User
+
+    group = Group.objects.order_by('-posts_count').first()
+    author = User.objects.order_by('-stats__posts_count').first()
+    post = Post.objects.order_by('-pk').first()
+    return {
+        'index': ('GET', reverse('posts:index'), None),
+        'index_page_50': ('GET', reverse('posts:index') + '?page=50', None),
+        'group_posts': (
+            'GET', reverse('posts:group_list', args=[group.slug]), None),
+        'profile': (
+            'GET', reverse('posts:profile', args=[author.username]), None),
+        'post_detail': (
+            'GET', reverse('posts:post_detail', args=[post.pk]), None),
+        'post_create': (
+            'POST', reverse('posts:post_create'),
+            {'text': 'Пост из бенчмарка', 'group': group.pk}),
+    }
+
+
+def run_client(scenarios, user, requests, warmup):
+    from django.test import Client
+
+    guest = Client()
+    author = Client()
+    author.force_login(user)
+    results = {}
+    for name, (method, url, data) in scenarios.items():
+        if method == 'POST':
+            def send():
+                author.post(url, data)
+        else:
+            def send():
+                guest.get(url)
+        results[name] = measure(send, requests, warmup)
+    return results
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args):
+        return None
+
+
+def run_wsgi(scenarios, user, requests, warmup):
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY
+    from django.contrib.auth import SESSION_KEY
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.core.wsgi import get_wsgi_application
+
+    server = make_server('127.0.0.1', 0, get_wsgi_application(),
+                         handler_class=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+    opener = urllib.request.build_opener(NoRedirect)
+
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    cookies = {settings.SESSION_COOKIE_NAME: session.session_key}
+
+    def fetch(url, data=None, headers=None):
+        request = urllib.request.Request(base + url, data=data,
+                                         headers=headers or {})
+        try:
+            with opener.open(request) as response:
+                response.read()
+                return response.headers
+        except urllib.error.HTTPError as error:
+            # Редирект после создания поста — ожидаемый ответ
+            if error.code != 302:
+                raise
+            return error.headers
+
+    results = {}
+    try:
+        for name, (method, url, data) in scenarios.items():
+            if method == 'POST':
+                cookie = '; '.join(f'{k}={v}' for k, v in cookies.items())
+                headers = fetch(url, headers={'Cookie': cookie})
+                token = SimpleCookie(headers['Set-Cookie'])[
+                    settings.CSRF_COOKIE_NAME].value
+                cookie += f'; {settings.CSRF_COOKIE_NAME}={token}'
+                body = urlencode(data).encode()
+                auth_headers = {'Cookie': cookie, 'X-CSRFToken': token}
+
+                def send():
+                    fetch(url, body, auth_headers)
+            else:
+                def send():
+                    fetch(url)
+            results[name] = measure(send, requests, warmup)
+    finally:
+        server.shutdown()
+    return results
+
+
+def compare(current, previous_path):
+    with open(previous_path) as file:
+        previous = json.load(file)
+    print(f'\nСравнение с {previous["commit"]}:')
+    for mode, scenarios in current['results'].items():
+        for name, result in scenarios.items():
+            before = previous['results'].get(mode, {}).get(name)
+            if before:
+                print(f'{mode:6} {name:15} p50 {before["p50_ms"]:8} -> '
+                      f'{result["p50_ms"]:8} ms, rps {before["rps"]:8} -> '
+                      f'{result["rps"]:8}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--posts', type=int, default=10_000)
+    parser.add_argument('--authors', type=int, default=1_000)
+    parser.add_argument('--groups', type=int, default=1_000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--db', help='путь к SQLite-базе (по умолчанию tmp)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='отключить кэши (YATUBE_CACHE_BACKEND=dummy)')
+    parser.add_argument('--skip-wsgi', action='store_true')
+    parser.add_argument('--output', help='куда записать JSON с итогами')
+    parser.add_argument('--compare', help='JSON прошлого прогона')
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ['YATUBE_CACHE_BACKEND'] = 'dummy'
+    setup_django(args.db)
+    from posts import seeding
+    from posts.models import User
+
+    started = time.perf_counter()
+    seeding.seed(args.posts, args.authors, args.groups)
+    print(f'Засеяно {args.posts} постов за '
+          f'{time.perf_counter() - started:.1f} с')
+    user = User.objects.create_user(username=USERNAME)
+
+    scenarios = targets()
+    results = {'client': run_client(scenarios, user, args.requests,
+                                    args.warmup)}
+    if not args.skip_wsgi:
+        results['wsgi'] = run_wsgi(scenarios, user, args.requests,
+                                   args.warmup)
+
+    report = {
+        'commit': git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'dataset': {
+            'posts': args.posts,
+            'authors': args.authors,
+            'groups': args.groups,
+            'cache': not args.no_cache,
+        },
+        'results': results,
+    }
+    for mode, scenarios_results in results.items():
+        for name, result in scenarios_results.items():
+            print(f'{mode:6} {name:15} {result["rps"]:8} rps  '
+                  f'p50 {result["p50_ms"]:7} ms  p99 {result["p99_ms"]:7} ms')
+
+    output = args.output or os.path.join(RESULTS_DIR,
+                                         f'{report["commit"]}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f'Итоги записаны в {output}')
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
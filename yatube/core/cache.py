@@ -0,0 +1,114 @@
+"""Общие помощники для работы с кэшами проекта.
+
+Псевдонимы кэшей описаны в settings.CACHES: default, pages,
+fragments и counters.
+"""
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+LOCK_TIMEOUT = 30
+EARLY_BETA = 1.0
+# Бэкенды, у которых incr атомарен: locmem под блокировкой (но только
+# в одном процессе), redis командой INCR. FileBasedCache читает и
+# записывает файл отдельно, и два процесса могут получить одну версию.
+ATOMIC_INCR_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django_redis.cache.RedisCache',
+)
+
+
+def get_cache(alias='default'):
+    return caches[alias]
+
+
+def clear_all():
+    """Очищает все кэши проекта, например между тестами."""
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+def atomic_incr(alias='default'):
+    """Гарантирует ли incr кэша, что каждый вызов получит своё значение."""
+    return settings.CACHES[alias]['BACKEND'] in ATOMIC_INCR_BACKENDS
+
+
+def _version_key(scope):
+    return f'version:{scope}'
+
+
+def get_versions(scopes, alias='default'):
+    """Текущие версии областей кэша в том же порядке."""
+    cache = caches[alias]
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Вытесненная версия не должна совпасть со старой,
+            # поэтому отсчёт начинается с текущего времени
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def versioned_key(key, scopes, alias='default'):
+    """Ключ, который устаревает при bump_version любой из областей."""
+    versions = ':'.join(map(str, get_versions(scopes, alias)))
+    return f'{key}:v{versions}'
+
+
+def bump_version(scopes, alias='default'):
+    """Увеличивает версии областей, возвращает новые (None — не было)."""
+    cache = caches[alias]
+    versions = []
+    for scope in scopes:
+        try:
+            versions.append(cache.incr(_version_key(scope)))
+        except ValueError:
+            # Без версии нет и ключей, которые надо сбросить
+            versions.append(None)
+    return versions
+
+
+def _is_fresh(expires, delta, now, beta):
+    # Вероятностный досрочный пересчёт (XFetch): чем ближе срок и
+    # дольше вычисление, тем вероятнее пересчитать ключ заранее
+    return now - delta * beta * math.log(1 - random.random()) < expires
+
+
+def get_or_compute(key, compute, timeout, alias='default', stale=None,
+                   version=None, cache_if=None, beta=EARLY_BETA):
+    """Достаёт значение из кэша или вычисляет его один раз.
+
+    Значение хранится ещё stale секунд после устаревания, а смена
+    version тоже делает его устаревшим. Пока один процесс
+    пересчитывает ключ под блокировкой, остальные отдают устаревшее
+    значение вместо одновременного пересчёта. cache_if(value) может
+    запретить сохранение результата.
+    """
+    cache = caches[alias]
+    stale = timeout if stale is None else stale
+    cached = cache.get(key)
+    now = time.time()
+    if cached is not None:
+        cached_version, expires, delta, value = cached
+        if cached_version == version and _is_fresh(expires, delta, now, beta):
+            return value
+    lock = f'{key}:lock'
+    locked = cache.add(lock, 1, LOCK_TIMEOUT)
+    if not locked and cached is not None:
+        return value
+    try:
+        value = compute()
+        delta = time.time() - now
+        if cache_if is None or cache_if(value):
+            cache.set(
+                key, (version, now + timeout, delta, value), timeout + stale
+            )
+    finally:
+        if locked:
+            cache.delete(lock)
+    return value
@@ -0,0 +1,74 @@
+"""Сжатие тел ответов gzip и brotli.
+
+brotli — необязательная зависимость: без пакета brotli остаётся gzip.
+"""
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Предпочтительные кодировки первыми
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def _quality(params):
+    """Вес q из параметров кодировки; без q — 1, нечитаемый — 0."""
+    for param in params:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'q':
+            try:
+                return float(value)
+            except ValueError:
+                return 0
+    return 1
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме запрещённых q=0.
+
+    Кривой заголовок не должен ронять запрос: кодировка с нечитаемым
+    весом считается неприемлемой.
+    """
+    accepted = set()
+    for item in header.split(','):
+        name, *params = item.split(';')
+        name = name.strip().lower()
+        if name and _quality(params) > 0:
+            accepted.add(name)
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header)
+    for encoding in ENCODINGS:
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding, level):
+    """Сжимает поток, отдавая каждый кусок сразу, без буферизации."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,29 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.routers import PRIMARY
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную SQLite-базу в реплики из DATABASE_REPLICAS '
+        'для локальной проверки чтения с реплик.'
+    )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('Реплики не настроены: YATUBE_DB_REPLICAS.')
+        source = connections[PRIMARY].settings_dict
+        if source['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('Команда работает только с SQLite.')
+        with sqlite3.connect(source['NAME']) as primary:
+            for alias in settings.DATABASE_REPLICAS:
+                target = connections[alias].settings_dict['NAME']
+                with sqlite3.connect(target) as replica:
+                    primary.backup(replica)
+                self.stdout.write(self.style.SUCCESS(
+                    f'{alias}: скопировано в {target}'
+                ))
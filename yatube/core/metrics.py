@@ -0,0 +1,146 @@
+"""Счётчики времени и запросов к базе по view.
+
+Данные копятся в памяти процесса: у каждого воркера свои гистограммы.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+# Верхние границы корзин гистограмм
+MS_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_local = threading.local()
+_lock = threading.Lock()
+_gauges = {}
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+
+    def add(self, value):
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                break
+        else:
+            index = len(self.bounds)
+        self.counts[index] += 1
+        self.sum += value
+
+    def as_dict(self):
+        labels = [f'<={bound}' for bound in self.bounds] + ['inf']
+        return {'sum': round(self.sum, 3), **dict(zip(labels, self.counts))}
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.total = Histogram(MS_BUCKETS)
+        self.db = Histogram(MS_BUCKETS)
+        self.template = Histogram(MS_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'total_ms': self.total.as_dict(),
+            'db_ms': self.db.as_dict(),
+            'template_ms': self.template.as_dict(),
+            'queries': self.queries.as_dict(),
+        }
+
+
+_views = defaultdict(ViewStats)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.total = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Обёртка connection.execute_wrapper
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries", '
+            f'tpl;dur={self.template * 1000:.1f}, '
+            f'total;dur={self.total * 1000:.1f}'
+        )
+
+
+@contextmanager
+def collect():
+    """Собирает метрики всего, что выполняется внутри блока."""
+    timings = RequestTimings()
+    _local.timings = timings
+    started = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            yield timings
+    finally:
+        timings.total = time.perf_counter() - started
+        _local.timings = None
+
+
+@contextmanager
+def template_timer():
+    """Учитывает время отрисовки шаблона; вложенные не считаются дважды."""
+    timings = getattr(_local, 'timings', None)
+    if timings is None:
+        yield
+        return
+    timings.template_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.template_depth -= 1
+        if not timings.template_depth:
+            timings.template += time.perf_counter() - started
+
+
+def record(view_name, timings):
+    with _lock:
+        stats = _views[view_name]
+        stats.requests += 1
+        stats.total.add(timings.total * 1000)
+        stats.db.add(timings.db * 1000)
+        stats.template.add(timings.template * 1000)
+        stats.queries.add(timings.queries)
+
+
+def register_gauge(name, func):
+    """Добавляет в отчёт значение func(), например счётчики кэша."""
+    _gauges[name] = func
+
+
+def snapshot():
+    with _lock:
+        views = {name: stats.as_dict() for name, stats in _views.items()}
+    return {
+        'views': views,
+        'gauges': {name: func() for name, func in _gauges.items()},
+    }
+
+
+def reset():
+    with _lock:
+        _views.clear()
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics, routers
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+
+class MetricsMiddleware:
+    """Считает запросы к базе и время ответа по имени URL.
+
+    Итог запроса отдаётся заголовком Server-Timing и копится в
+    гистограммах, которые показывает core:metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with metrics.collect() as timings:
+            response = self.get_response(request)
+        match = request.resolver_match
+        metrics.record(match.view_name if match else 'unresolved', timings)
+        response['Server-Timing'] = timings.server_timing()
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Включает чтение с реплики для view, помеченных replica_reads.
+
+    После записи в основную базу ставит cookie, пока она жива, чтение
+    идёт с основной базы (read-your-writes).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routers.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = routers.end_request()
+        if wrote:
+            response.set_cookie(
+                routers.PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ('GET', 'HEAD')
+            and getattr(view_func, 'replica_reads', False)
+            and routers.PIN_COOKIE not in request.COOKIES
+        ):
+            routers.use_replica()
+
+
+class CompressionMiddleware:
+    """Сжимает текстовые ответы brotli или gzip.
+
+    Ответы короче COMPRESSION_MIN_SIZE не сжимаются, потоковые ответы
+    сжимаются по кускам. Уровень задают COMPRESSION_GZIP_LEVEL и
+    COMPRESSION_BROTLI_QUALITY.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.levels = {
+            'gzip': settings.COMPRESSION_GZIP_LEVEL,
+            'br': settings.COMPRESSION_BROTLI_QUALITY,
+        }
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(
+                COMPRESSIBLE_TYPES)
+            or not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        level = self.levels[encoding]
+        if response.streaming:
+            response.streaming_content = compression.compress_stream(
+                response.streaming_content, encoding, level
+            )
+            del response['Content-Length']
+        else:
+            content = compression.compress(response.content, encoding, level)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+        # Сжатое тело побайтно отличается, сильный ETag тут неверен
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,86 @@
+"""Чтение лент с реплик базы.
+
+View, помеченные replica_reads, на GET и HEAD читают со случайной
+реплики из settings.DATABASE_REPLICAS; всё остальное, как и любая
+запись, идёт в default. Пользователь, который только что что-то
+записал, получает cookie PIN_COOKIE и ещё REPLICA_PIN_SECONDS читает
+с основной базы, чтобы сразу видеть свои изменения. Анонимы могут
+видеть отстающую реплику, но то, что кладётся в кэш на время жизни
+версии, читается внутри primary_reads(): иначе отставание реплики
+закрепилось бы в кэше под уже новой версией.
+"""
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+PRIMARY = 'default'
+PIN_COOKIE = 'db_primary'
+# Сессии всегда читаются с основной базы: свежий вход ещё не доехал
+# до реплики
+PRIMARY_APPS = {'sessions'}
+
+_state = threading.local()
+
+
+def replica_reads(view):
+    """Помечает view, которой можно читать с реплики."""
+    view.replica_reads = True
+    return view
+
+
+def start_request():
+    _state.use_replica = False
+    _state.wrote = False
+
+
+def use_replica():
+    _state.use_replica = True
+
+
+def end_request():
+    """Сбрасывает состояние запроса, возвращает, была ли запись."""
+    wrote = getattr(_state, 'wrote', False)
+    start_request()
+    return wrote
+
+
+@contextmanager
+def reading_from_replica():
+    start_request()
+    use_replica()
+    try:
+        yield
+    finally:
+        end_request()
+
+
+@contextmanager
+def primary_reads():
+    """Временно направляет чтение текущего запроса в основную базу."""
+    replica = getattr(_state, 'use_replica', False)
+    _state.use_replica = False
+    try:
+        yield
+    finally:
+        _state.use_replica = replica
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas and getattr(_state, 'use_replica', False)
+            and model._meta.app_label not in PRIMARY_APPS
+        ):
+            return random.choice(replicas)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики хранят те же данные, что и основная база
+        return True
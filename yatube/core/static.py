@@ -0,0 +1,76 @@
+"""Раздача собранной статики прямо из WSGI, до Django.
+
+Для хэшированных имён (ManifestStaticFilesStorage) ставится
+Cache-Control immutable на год: при изменении файла меняется и имя.
+Если клиент принимает br или gzip и рядом лежит сжатая копия из
+core.storage, отдаётся она.
+"""
+import mimetypes
+import os
+import re
+
+from .compression import accepted_encodings
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Нехэшированные имена могут смениться при следующем деплое
+SHORT = 'public, max-age=300'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+BLOCK_SIZE = 64 * 1024
+
+
+def _read(file):
+    with file:
+        yield from iter(lambda: file.read(BLOCK_SIZE), b'')
+
+
+class PrecompressedStaticFiles:
+    def __init__(self, application, root, prefix):
+        self.application = application
+        self.root = os.path.realpath(root)
+        self.prefix = prefix
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if (
+            environ['REQUEST_METHOD'] not in ('GET', 'HEAD')
+            or not path.startswith(self.prefix)
+        ):
+            return self.application(environ, start_response)
+        filename = self.find(path[len(self.prefix):])
+        if filename is None:
+            return self.application(environ, start_response)
+        return self.serve(environ, start_response, filename)
+
+    def find(self, name):
+        filename = os.path.realpath(os.path.join(self.root, name))
+        if (
+            not filename.startswith(self.root + os.sep)
+            or not os.path.isfile(filename)
+        ):
+            return None
+        return filename
+
+    def serve(self, environ, start_response, filename):
+        content_type, _ = mimetypes.guess_type(filename)
+        headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Cache-Control',
+             IMMUTABLE if HASHED_NAME.search(filename) else SHORT),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        accepted = accepted_encodings(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted and os.path.isfile(filename + suffix):
+                filename += suffix
+                headers.append(('Content-Encoding', encoding))
+                break
+        headers.append(('Content-Length', str(os.path.getsize(filename))))
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        file = open(filename, 'rb')
+        wrapper = environ.get('wsgi.file_wrapper')
+        if wrapper:
+            return wrapper(file, BLOCK_SIZE)
+        return _read(file)
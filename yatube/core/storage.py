@@ -0,0 +1,51 @@
+"""Хранилище статики с хэшами в именах и сжатыми копиями файлов.
+
+collectstatic кладёт рядом с каждым хэшированным текстовым файлом
+копии .gz и, если установлен пакет brotli, .br. Их отдаёт
+core.static.PrecompressedStaticFiles.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.txt', '.json', '.xml', '.ico')
+# Меньшие файлы сжатие почти не уменьшает
+MIN_SIZE = 256
+
+
+def compress(path):
+    """Пишет path.gz и path.br, если они меньше исходного файла."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < MIN_SIZE:
+        return
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data)
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as file:
+                file.write(compressed)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, *args, **kwargs):
+        compressed = set()
+        for name, hashed_name, processed in super().post_process(
+            *args, **kwargs
+        ):
+            if (
+                not kwargs.get('dry_run')
+                and hashed_name
+                and not isinstance(processed, Exception)
+                and hashed_name.endswith(COMPRESSIBLE)
+                and hashed_name not in compressed
+            ):
+                compressed.add(hashed_name)
+                compress(self.path(hashed_name))
+            yield name, hashed_name, processed
@@ -1,3 +1,327 @@
-# from django.test import TestCase
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.contrib.sessions.models import Session
+from django.db import connection, router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, TestCase, override_settings,
+)
+from django.urls import reverse
+
+from core import metrics, routers
+from core.db import apply_sqlite_pragmas
+from core.static import IMMUTABLE, PrecompressedStaticFiles
+from core.storage import brotli
+from core.compression import accepted_encodings
+from core.middleware import CompressionMiddleware, ReplicaRoutingMiddleware
+from core.cache import (
+    bump_version, clear_all, get_cache, get_or_compute, versioned_key,
+)
+from posts.page_cache import anonymous_page_cache
+
+METRICS = reverse("core:metrics")
+INDEX = reverse("posts:index")
+
+
+class CacheHelpersTest(SimpleTestCase):
+    def setUp(self):
+        clear_all()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_get_or_compute_caches_value(self):
+        """Значение вычисляется один раз до устаревания."""
+        self.assertEqual(get_or_compute("key", self.compute, 60), 1)
+        self.assertEqual(get_or_compute("key", self.compute, 60), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_served_while_locked(self):
+        """Пока ключ пересчитывает другой процесс, отдаётся старое."""
+        get_or_compute("key", self.compute, -1, stale=60)
+        get_cache().add("key:lock", 1)
+        self.assertEqual(get_or_compute("key", self.compute, 60), 1)
+        get_cache().delete("key:lock")
+        self.assertEqual(get_or_compute("key", self.compute, 60), 2)
+
+    def test_versioned_key_changes_on_bump(self):
+        """bump_version делает старые ключи недостижимыми."""
+        key = versioned_key("page", ["scope", "other"])
+        self.assertEqual(key, versioned_key("page", ["scope", "other"]))
+        bump_version(["scope"])
+        self.assertNotEqual(key, versioned_key("page", ["scope", "other"]))
+
+    def test_version_change_recomputes(self):
+        """Смена версии делает значение устаревшим."""
+        get_or_compute("key", self.compute, 60, version=1)
+        self.assertEqual(get_or_compute("key", self.compute, 60, version=1), 1)
+        self.assertEqual(get_or_compute("key", self.compute, 60, version=2), 2)
+
+    def test_cache_if_skips_value(self):
+        """cache_if может запретить сохранение результата."""
+        get_or_compute("key", self.compute, 60, cache_if=lambda value: False)
+        get_or_compute("key", self.compute, 60)
+        self.assertEqual(self.calls, 2)
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        clear_all()
+        metrics.reset()
+        self.guest_client = Client()
+        self.staff_client = Client()
+        self.staff_client.force_login(get_user_model().objects.create_user(
+            username="Staff", is_staff=True,
+        ))
+
+    def test_server_timing_header(self):
+        """Ответ сообщает время базы, шаблонов и число запросов."""
+        header = self.guest_client.get(INDEX)["Server-Timing"]
+        for part in ("db;dur=", "queries", "tpl;dur=", "total;dur="):
+            with self.subTest(part=part):
+                self.assertIn(part, header)
+
+    def test_endpoint_is_staff_only(self):
+        """Гистограммы видит только персонал."""
+        self.guest_client.get(INDEX)
+        self.assertEqual(self.guest_client.get(METRICS).status_code, 302)
+        data = self.staff_client.get(METRICS).json()
+        self.assertEqual(data["views"]["posts:index"]["requests"], 1)
+        self.assertIn("post_cards", data["gauges"])
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user_model = get_user_model()
+
+    def route(self, request, view):
+        """Прогоняет запрос через middleware, возвращает базы чтения."""
+        used = {}
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            response = view(request)
+            used["read"] = router.db_for_read(self.user_model)
+            used["session"] = router.db_for_read(Session)
+            return response
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return used, middleware(request)
+
+    def test_marked_views_read_from_replica(self):
+        """Помеченная view на GET читает с реплики, сессии - с основной."""
+        view = routers.replica_reads(lambda request: HttpResponse())
+        used, response = self.route(self.factory.get("/"), view)
+        self.assertEqual(used, {"read": "replica", "session": "default"})
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+
+    def test_other_views_use_primary(self):
+        """Непомеченные view и небезопасные методы идут в основную базу."""
+        marked = routers.replica_reads(lambda request: HttpResponse())
+        for request, view in (
+            (self.factory.get("/"), lambda request: HttpResponse()),
+            (self.factory.post("/"), marked),
+        ):
+            with self.subTest(method=request.method):
+                used, _ = self.route(request, view)
+                self.assertEqual(used["read"], "default")
+
+    def test_write_pins_reads_to_primary(self):
+        """После записи пользователь читает с основной базы."""
+        def write(request):
+            router.db_for_write(self.user_model)
+            return HttpResponse()
+
+        _, response = self.route(self.factory.post("/"), write)
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+
+        request = self.factory.get("/")
+        request.COOKIES[routers.PIN_COOKIE] = "1"
+        view = routers.replica_reads(lambda request: HttpResponse())
+        used, _ = self.route(request, view)
+        self.assertEqual(used["read"], "default")
+
+    def test_cached_pages_render_from_primary(self):
+        """Страница для кэша анонимов отрисовывается с основной базы."""
+        clear_all()
+        rendered = {}
+
+        def page(request):
+            rendered["read"] = router.db_for_read(self.user_model)
+            return HttpResponse()
+
+        view = routers.replica_reads(
+            anonymous_page_cache(lambda: "replica-test")(page)
+        )
+        request = self.factory.get("/")
+        request.user = AnonymousUser()
+        used, _ = self.route(request, view)
+        self.assertEqual(rendered["read"], "default")
+        self.assertEqual(used["read"], "replica")
+
+    def test_state_does_not_leak(self):
+        """Вне запроса чтение идёт в основную базу."""
+        with routers.reading_from_replica():
+            self.assertEqual(router.db_for_read(self.user_model), "replica")
+        self.assertEqual(router.db_for_read(self.user_model), "default")
+
+
+class SqlitePragmasTest(TestCase):
+    @override_settings(SQLITE_PRAGMAS={"cache_size": -1234})
+    def test_pragmas_applied(self):
+        """PRAGMA из настроек выполняются на соединении."""
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -1234)
+
+
+class StaticPipelineTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        with override_settings(
+            STATIC_ROOT=cls.root,
+            STATICFILES_STORAGE=(
+                "core.storage.CompressedManifestStaticFilesStorage"
+            ),
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            cls.css = staticfiles_storage.url("css/bootstrap.min.css")
+        cls.handler = PrecompressedStaticFiles(
+            lambda environ, start_response: [b"django"], cls.root, "/static/"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.root)
+        super().tearDownClass()
+
+    def get(self, path, encoding=""):
+        response = {}
+
+        def start_response(status, headers):
+            response["status"] = status
+            response["headers"] = dict(headers)
+
+        body = b"".join(self.handler({
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "HTTP_ACCEPT_ENCODING": encoding,
+        }, start_response))
+        return response, body
+
+    def test_hashed_name_and_compressed_copies(self):
+        """collectstatic кладёт хэшированные файлы со сжатыми копиями."""
+        self.assertRegex(self.css, r"bootstrap\.min\.[0-9a-f]{12}\.css$")
+        path = os.path.join(self.root, self.css[len("/static/"):])
+        self.assertTrue(os.path.exists(f"{path}.gz"))
+        self.assertEqual(os.path.exists(f"{path}.br"), brotli is not None)
+
+    def test_serves_precompressed_immutable(self):
+        """Сжатая копия отдаётся тем, кто её принимает, с immutable."""
+        plain, body = self.get(self.css)
+        self.assertEqual(plain["headers"]["Cache-Control"], IMMUTABLE)
+        self.assertNotIn("Content-Encoding", plain["headers"])
+        packed, packed_body = self.get(self.css, "gzip, deflate")
+        self.assertEqual(packed["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(packed_body), body)
+        self.assertLess(
+            int(packed["headers"]["Content-Length"]),
+            int(plain["headers"]["Content-Length"]),
+        )
+
+    def test_refused_encodings_get_plain_file(self):
+        """gzip;q=0 и чужие кодировки с gzip в имени получают файл как есть."""
+        for encoding in ("gzip;q=0", "x-gzip-foo", "gzip;q=abc"):
+            with self.subTest(encoding=encoding):
+                response, _ = self.get(self.css, encoding)
+                self.assertNotIn("Content-Encoding", response["headers"])
+
+    def test_other_paths_reach_django(self):
+        """Чужие и выходящие за STATIC_ROOT пути идут в приложение."""
+        for path in ("/", "/static/missing.css", "/static/../manage.py"):
+            with self.subTest(path=path):
+                self.assertEqual(self.get(path), ({}, b"django"))
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+    BODY = "<ul><li>Повторяющийся пост</li></ul>".encode() * 100
+
+    def get(self, response, encoding="gzip"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        """Длинный HTML сжимается gzip, ETag становится слабым."""
+        response = HttpResponse(self.BODY)
+        response["ETag"] = '"etag"'
+        response = self.get(response)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], 'W/"etag"')
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), self.BODY)
+
+    def test_skipped_responses(self):
+        """Короткие, нетекстовые и отвергнутые клиентом ответы не сжимаются."""
+        for body, content_type, encoding in (
+            (b"short", "text/html", "gzip"),
+            (self.BODY, "image/png", "gzip"),
+            (self.BODY, "text/html", "gzip;q=0, identity"),
+            (self.BODY, "text/html", ""),
+        ):
+            with self.subTest(content_type=content_type, encoding=encoding):
+                response = self.get(
+                    HttpResponse(body, content_type=content_type), encoding
+                )
+                self.assertFalse(response.has_header("Content-Encoding"))
+                self.assertEqual(response.content, body)
+
+    def test_streaming(self):
+        """Потоковый ответ сжимается по кускам и без Content-Length."""
+        chunks = [self.BODY[:500], self.BODY[500:]]
+        response = self.get(StreamingHttpResponse(iter(chunks)))
+        self.assertFalse(response.has_header("Content-Length"))
+        parts = list(response.streaming_content)
+        self.assertGreater(len([part for part in parts if part]), 1)
+        self.assertEqual(gzip.decompress(b"".join(parts)), self.BODY)
+
+    def test_accept_encoding(self):
+        """Разбор Accept-Encoding учитывает q=0."""
+        self.assertEqual(
+            accepted_encodings("gzip, br;q=0, deflate;q=0.5"),
+            {"gzip", "deflate"},
+        )
+
+    def test_malformed_accept_encoding(self):
+        """Кривой Accept-Encoding не роняет запрос."""
+        for header, accepted in (
+            ("gzip;q=abc", set()),
+            ("gzip;q=", set()),
+            ("gzip;q=1;foo=bar", {"gzip"}),
+            ("gzip;foo=bar, ;q=1", {"gzip"}),
+        ):
+            with self.subTest(header=header):
+                self.assertEqual(accepted_encodings(header), accepted)
+        response = self.get(HttpResponse(self.BODY), "gzip;q=abc")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, self.BODY)
+
+    @unittest.skipUnless(brotli, "пакет brotli не установлен")
+    def test_brotli_preferred(self):
+        response = self.get(HttpResponse(self.BODY), "gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), self.BODY)
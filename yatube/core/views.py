@@ -1,3 +1,12 @@
-# from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
 
-# Create your views here.
+from . import metrics as view_metrics
+
+
+@staff_member_required
+def metrics(request):
+    """Гистограммы времени и запросов по view этого процесса."""
+    return JsonResponse(
+        view_metrics.snapshot(), json_dumps_params={'ensure_ascii': False}
+    )
@@ -1,5 +1,56 @@
 from django.contrib import admin
+from django.core.paginator import EmptyPage, Paginator
+from django.db import transaction
+from django.utils.functional import cached_property
+from django.utils.text import Truncator
+
+from . import counters
 from .models import Post, Group
+from .search import search
+
+TEXT_PREVIEW_LENGTH = 80
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator changelist без COUNT(*) по всей таблице постов.
+
+    Без фильтров число постов берётся из кэша counters, с фильтрами
+    считается не дальше COUNT_LIMIT строк. Как и в CountingPaginator,
+    страница за пределами оценки перепроверяется точным COUNT(*).
+    """
+
+    COUNT_LIMIT = 10_000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        if not queryset.query.where:
+            return counters.get_count(counters.ALL, queryset)
+        count = queryset[:self.COUNT_LIMIT].count()
+        self.exact = count < self.COUNT_LIMIT
+        return count
+
+    def refresh(self):
+        self.__dict__.pop('num_pages', None)
+        queryset = self.object_list.order_by()
+        if queryset.query.where:
+            self.count = queryset.count()
+        else:
+            self.count = counters.refresh_count(counters.ALL, queryset)
+        self.exact = True
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.exact or int(number) < 1:
+                raise
+        self.refresh()
+        return super().validate_number(number)
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -11,10 +62,49 @@ class PostAdmin(admin.ModelAdmin):
         'group',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    # По pub_date есть индекс post_feed_idx
+    date_hierarchy = 'pub_date'
+    # Выпадающие списки с каждым автором и группой не грузятся
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('group',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def get_queryset(self, request):
+        # Полный текст нужен только форме поста, списку хватает отрывка
+        return super().get_queryset(request).defer('text')
+
+    def get_list_display(self, request):
+        # Вместо полного текста в списке выводится его начало
+        return tuple(
+            'text_preview' if name == 'text' else name
+            for name in super().get_list_display(request)
+        )
+
+    def text_preview(self, post):
+        return Truncator(post.excerpt).chars(TEXT_PREVIEW_LENGTH)
+    text_preview.short_description = 'Текст поста'
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск идёт по полнотекстовому индексу, а не LIKE по search_fields
+        if not search_term.strip():
+            return queryset, False
+        return search(queryset, search_term), False
+
+    def delete_queryset(self, request, queryset):
+        # Счётчики постов правятся сигналами в той же транзакции
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'posts_count')
+    search_fields = ('title', 'slug')
+
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
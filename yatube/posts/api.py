@@ -0,0 +1,96 @@
+"""Read-only JSON-версии лент для мобильных клиентов.
+
+Данные берутся через .values(), без создания объектов моделей
+и без шаблонов, а ответ отдаётся потоком по мере сериализации.
+"""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from .counters import ALL, author_scope, group_scope
+from .models import Group, Post, User
+from .utils import CURSOR_PARAM, pagination
+
+# Имя поля в ответе: поле для .values()
+FEED_FIELDS = {
+    'id': 'id',
+    'excerpt': 'excerpt',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+
+
+def page_links(request, page_obj):
+    """Ссылки на соседние страницы в том же режиме пагинации."""
+    if getattr(page_obj, 'cursor_mode', False):
+        param = CURSOR_PARAM
+        next_value, previous_value = (
+            page_obj.next_cursor, page_obj.previous_cursor
+        )
+    else:
+        param = 'page'
+        next_value = page_obj.has_next() and page_obj.next_page_number()
+        previous_value = (
+            page_obj.has_previous() and page_obj.previous_page_number()
+        )
+    return {
+        'next': next_value and f'{request.path}?{param}={next_value}' or None,
+        'previous': (
+            previous_value and f'{request.path}?{param}={previous_value}'
+            or None
+        ),
+    }
+
+
+def stream_page(request, page_obj):
+    """Сериализует страницу по одному посту за раз."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    yield '{"results": ['
+    for number, row in enumerate(page_obj):
+        if number:
+            yield ', '
+        yield encoder.encode(
+            {name: row[field] for name, field in FEED_FIELDS.items()}
+        )
+    yield '], '
+    yield encoder.encode(page_links(request, page_obj))[1:]
+
+
+def feed_response(request, posts, scope=ALL):
+    posts = posts.values(*FEED_FIELDS.values())
+    page_obj = pagination(request, posts, scope=scope)
+    return StreamingHttpResponse(
+        stream_page(request, page_obj),
+        content_type='application/json; charset=utf-8',
+    )
+
+
+@require_GET
+def index(request):
+    return feed_response(request, Post.objects.all())
+
+
+@require_GET
+def group_posts(request, slug):
+    group_id = get_object_or_404(
+        Group.objects.values_list('pk', flat=True), slug=slug
+    )
+    return feed_response(
+        request,
+        Post.objects.filter(group_id=group_id),
+        scope=group_scope(group_id),
+    )
+
+
+@require_GET
+def profile(request, username):
+    author_id = get_object_or_404(
+        User.objects.values_list('pk', flat=True), username=username
+    )
+    return feed_response(
+        request,
+        Post.objects.filter(author_id=author_id),
+        scope=author_scope(author_id),
+    )
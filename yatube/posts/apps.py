@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from core.metrics import register_gauge
+
+        from . import fragments, latest, signals  # noqa: F401
+
+        register_gauge('post_cards', lambda: dict(fragments.stats))
+        register_gauge('latest_posts', lambda: dict(latest.stats))
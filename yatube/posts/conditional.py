@@ -0,0 +1,135 @@
+"""Условные GET по ETag для лент и страницы поста.
+
+ETag ленты строится из MAX(updated) постов её области и версии кэша
+страниц области, которую сигналы меняют и при удалении поста, и при
+смене имени автора или группы. Сам MAX(updated) кэшируется под той же
+версией, так что повторная проверка не ходит в базу. ETag зависит от
+пользователя: авторизованным страницы отрисовываются иначе. Если ETag
+совпал с запросом, view не вызывается и шаблоны не отрисовываются.
+
+Last-Modified не отдаётся: MAX(updated) не меняется ни при удалении
+поста, ни при переименовании автора или группы, и If-Modified-Since
+получал бы 304 на изменившуюся страницу.
+"""
+from hashlib import md5
+
+from django.db.models import Max
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition
+
+from core.cache import get_or_compute
+from core.routers import PRIMARY, primary_reads
+
+from . import latest, page_cache, post_cache
+from .models import Group, Post, User
+from .stats import author_stats
+
+
+def _etag(request, *parts):
+    parts += (request.user.pk,)
+    return md5(':'.join(map(str, parts)).encode()).hexdigest()
+
+
+def _conditional(get_etag):
+    """Проверка ETag до вызова view, без Last-Modified."""
+    return condition(etag_func=get_etag)
+
+
+def modified_key(scope):
+    return f'posts:modified:{scope}'
+
+
+def _latest(posts):
+    # Кортеж, чтобы отличить пустую ленту от несуществующей
+    return (posts.aggregate(latest=Max('updated'))['latest'],)
+
+
+def _feed_etag(request, scope, latest):
+    """ETag ленты; latest() даёт (MAX(updated),) или None для 404."""
+    version = page_cache.page_version(scope)
+
+    def compute():
+        # Как и страница, кэшируется под текущей версией
+        with primary_reads():
+            return latest()
+
+    cached = get_or_compute(
+        modified_key(scope),
+        compute,
+        page_cache.PAGE_TIMEOUT,
+        alias='pages',
+        stale=page_cache.PAGE_STALE,
+        version=version,
+        # Автор может появиться позже, не кэшируем его отсутствие
+        cache_if=lambda value: value is not None,
+    )
+    if cached is None:
+        raise Http404
+    modified, = cached
+    return _etag(
+        request,
+        modified,
+        version,
+        *page_cache.page_params(request),
+    )
+
+
+@_conditional
+def index_condition(request):
+    # MAX(updated) всех постов ведёт буфер последних постов
+    return _feed_etag(
+        request, page_cache.INDEX, lambda: (latest.modified(),)
+    )
+
+
+@_conditional
+def group_condition(request, slug):
+    def latest():
+        group = Group.objects.filter(slug=slug).values_list('pk').first()
+        return group and _latest(Post.objects.filter(group_id=group[0]))
+
+    return _feed_etag(request, page_cache.group_scope(slug), latest)
+
+
+@_conditional
+def profile_condition(request, username):
+    def latest():
+        author = User.objects.filter(username=username).values_list(
+            'pk').first()
+        return author and _latest(Post.objects.filter(author_id=author[0]))
+
+    return _feed_etag(
+        request, page_cache.profile_scope(username), latest
+    )
+
+
+def load_post(post_id):
+    """Пост с автором, числом его постов и группой: один запрос или кэш."""
+    def load():
+        post = get_object_or_404(
+            Post.objects.using(PRIMARY).select_related(
+                'author__stats', 'group'),
+            id=post_id,
+        )
+        author_stats(post.author)
+        return post
+
+    return post_cache.get_post(post_id, load)
+
+
+@_conditional
+def post_condition(request, post_id):
+    post = load_post(post_id)
+    author = post.author
+    group = post.group
+    return _etag(
+        request,
+        post.pk,
+        post.updated,
+        author.username,
+        author.get_full_name(),
+        author_stats(author).posts_count,
+        group and group.slug,
+        group and group.title,
+    )
@@ -0,0 +1,63 @@
+"""Кэшированные счётчики постов для пагинатора.
+
+Счётчики хранятся в кэше по областям: вся лента, группа, автор.
+Сигналы модели Post поправляют их на ±1, а точный COUNT(*)
+выполняется только когда ключа в кэше нет.
+"""
+from core.cache import get_cache
+
+ALL = 'all'
+COUNT_TIMEOUT = 60 * 60
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def post_scopes(group_id, author_id):
+    """Области, в которые попадает пост с такими группой и автором."""
+    scopes = [ALL, author_scope(author_id)]
+    if group_id is not None:
+        scopes.append(group_scope(group_id))
+    return scopes
+
+
+def _cache():
+    return get_cache('counters')
+
+
+def _key(scope):
+    return f'posts:count:{scope}'
+
+
+def get_count(scope, queryset):
+    """Возвращает счётчик области, при холодном кэше считает точно."""
+    count = _cache().get(_key(scope))
+    if count is None:
+        count = refresh_count(scope, queryset)
+    return count
+
+
+def refresh_count(scope, queryset):
+    count = queryset.count()
+    _cache().set(_key(scope), count, COUNT_TIMEOUT)
+    return count
+
+
+def adjust(scopes, delta):
+    """Инкрементально поправляет счётчики, которые уже есть в кэше."""
+    cache = _cache()
+    for scope in scopes:
+        try:
+            cache.incr(_key(scope), delta)
+        except ValueError:
+            # Холодный ключ посчитается точно при следующем запросе
+            pass
+
+
+def invalidate(scopes):
+    _cache().delete_many([_key(scope) for scope in scopes])
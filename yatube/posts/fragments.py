@@ -0,0 +1,90 @@
+"""Кэш отрисованных карточек постов для лент.
+
+Ключ карточки включает id поста, а вместе с карточкой хранится её
+версия: дата последнего изменения поста и версии его автора и группы.
+Правка поста, в том числе массовая через update(), смена имени автора
+или группы делают карточку устаревшей без обхода всех постов автора
+или группы.
+Счётчики попаданий ведутся в памяти процесса.
+"""
+from collections import Counter
+
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from core.cache import bump_version, get_cache, get_versions
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+CARD_TIMEOUT = 60 * 60 * 24
+stats = Counter(hits=0, misses=0)
+
+
+def card_key(post_id):
+    return f'posts:card:{post_id}'
+
+
+def author_scope(author_id):
+    return f'card-author:{author_id}'
+
+
+def group_scope(group_id):
+    return f'card-group:{group_id}'
+
+
+def _scopes(post):
+    scopes = [author_scope(post.author_id)]
+    if post.group_id is not None:
+        scopes.append(group_scope(post.group_id))
+    return scopes
+
+
+def _versions(posts):
+    """Версии авторов и групп карточек одним запросом к кэшу."""
+    scopes = sorted({scope for post in posts for scope in _scopes(post)})
+    return dict(zip(scopes, get_versions(scopes, alias='fragments')))
+
+
+def _version(post, versions):
+    return (
+        post.updated.timestamp(),
+        *(versions[scope] for scope in _scopes(post)),
+    )
+
+
+def render_cards(posts):
+    """Возвращает HTML карточек, дорисовывая только промахи кэша."""
+    posts = list(posts)
+    cache = get_cache('fragments')
+    cached = cache.get_many([card_key(post.pk) for post in posts])
+    versions = _versions(posts)
+    cards, missed = [], {}
+    for post in posts:
+        version, html = cached.get(card_key(post.pk), (None, None))
+        if version != _version(post, versions):
+            html = render_to_string(CARD_TEMPLATE, {'post': post})
+            missed[card_key(post.pk)] = (_version(post, versions), html)
+        cards.append(mark_safe(html))
+    if missed:
+        cache.set_many(missed, CARD_TIMEOUT)
+    stats['misses'] += len(missed)
+    stats['hits'] += len(posts) - len(missed)
+    return cards
+
+
+def invalidate(post_ids):
+    get_cache('fragments').delete_many(
+        [card_key(post_id) for post_id in post_ids]
+    )
+
+
+def bump_authors(author_ids):
+    bump_version(
+        [author_scope(author_id) for author_id in author_ids],
+        alias='fragments',
+    )
+
+
+def bump_groups(group_ids):
+    bump_version(
+        [group_scope(group_id) for group_id in group_ids], alias='fragments'
+    )
@@ -0,0 +1,210 @@
+"""Последние посты в памяти процесса для первой страницы главной.
+
+Каждый процесс держит CAPACITY самых новых постов вместе с автором и
+группой и MAX(updated) всех постов для ETag главной. Сигналы
+поправляют буфер на месте после фиксации транзакции и увеличивают общую
+версию в кэше default, поэтому этот кэш должен быть общим для воркеров
+(см. settings_production). Процесс, который видит чужую версию,
+перечитывает буфер из базы; если версия выросла ровно на его собственное
+изменение, буфер остаётся в силе. Это верно, только когда incr кэша
+атомарен (core.cache.atomic_incr): на файловом кэше два процесса могут
+одновременно получить одну и ту же версию, поэтому там буфер после
+каждого изменения перечитывается. Массовые операции в обход сигналов
+вызывают invalidate(). На случай потерянной версии буфер в любом
+случае перечитывается раз в BUFFER_TIMEOUT секунд.
+"""
+import threading
+import time
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Max
+
+from core.cache import atomic_incr, bump_version, get_versions
+from core.routers import PRIMARY
+
+from .models import Post
+from .utils import ITEMS_PER_PAGE
+
+VERSION_SCOPE = 'latest-posts'
+# Запас сверх страницы: удаления не заставляют сразу перечитывать буфер
+CAPACITY = ITEMS_PER_PAGE * 2
+BUFFER_TIMEOUT = 60
+stats = Counter(hits=0, reloads=0, changes=0)
+
+
+def _order(post):
+    return post.pub_date, post.pk
+
+
+class LatestPosts:
+    """Самые новые посты главной, от новых к старым.
+
+    Списки постов не меняются, а заменяются целиком, поэтому уже
+    выданные потокам посты остаются прежними.
+    """
+
+    def __init__(self, capacity, timeout=BUFFER_TIMEOUT):
+        self.capacity = capacity
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.version = None
+        # Версия, поднятая незафиксированным изменением этого процесса:
+        # посты буфера ещё верны, пока транзакция не зафиксирована
+        self.pending = None
+        self.loaded = 0
+        self.posts = []
+        # В базе нет постов старше последнего в буфере
+        self.complete = False
+        self.modified = None
+
+    def _load(self):
+        # Буфер живёт до следующей смены версии, поэтому читается с
+        # основной базы: отстающая реплика закрепила бы старые посты
+        posts = Post.objects.using(PRIMARY)
+        return (
+            list(posts.for_feed().order_by('-pub_date', '-pk')[
+                :self.capacity]),
+            posts.aggregate(latest=Max('updated'))['latest'],
+        )
+
+    def get(self, count):
+        """Первые count постов и MAX(updated), перечитывая устаревшее."""
+        version, = get_versions([VERSION_SCOPE])
+        now = time.monotonic()
+        with self.lock:
+            if (
+                self.version == version
+                and now - self.loaded < self.timeout
+                and (len(self.posts) >= count or self.complete)
+            ):
+                stats['hits'] += 1
+                return self.posts[:count], self.modified
+        posts, modified = self._load()
+        with self.lock:
+            # Версия взята до чтения: изменение во время чтения
+            # приведёт к повторному чтению на следующем запросе
+            self.version, self.posts, self.modified = (
+                version, posts, modified)
+            self.complete = len(posts) < self.capacity
+            self.loaded = now
+        stats['reloads'] += 1
+        return posts[:count], modified
+
+    def begin(self):
+        """Изменение внутри транзакции: до фиксации буфер не отдаётся.
+
+        Запросы на том же соединении уже видят незафиксированную
+        строку, поэтому до фиксации буфер перечитывается, а остальные
+        процессы узнают о смене версии сразу. Если транзакция откатится,
+        в буфере не останется поста, которого нет в базе.
+        """
+        with self.lock:
+            version, = bump_version([VERSION_SCOPE])
+            self.pending = (
+                version
+                if version is not None
+                and version - 1 in (self.version, self.pending)
+                else None
+            )
+            self.version = None
+
+    def _change(self, apply):
+        # Буфер остаётся в силе, только если версия выросла ровно на
+        # это изменение, иначе его перечитает следующий запрос
+        with self.lock:
+            version, = bump_version([VERSION_SCOPE])
+            pending, self.pending = self.pending, None
+            if (
+                version is None
+                or not atomic_incr()
+                or version - 1 not in (self.version, pending)
+                or not apply()
+            ):
+                self.version = None
+                return
+            self.version = version
+        stats['changes'] += 1
+
+    def save(self, post, created, updated):
+        """Вносит пост в буфер; post=None — изменён пост вне буфера."""
+        def apply():
+            self.modified = max(filter(None, (self.modified, updated)))
+            if post is None:
+                return True
+            if created and any(old.pk >= post.pk for old in self.posts):
+                # Пост уже в буфере: его перечитали на соединении, где
+                # он ещё не был зафиксирован
+                return False
+            rest = [old for old in self.posts if old.pk != post.pk]
+            if (
+                created and not self.complete and rest
+                and _order(post) < _order(rest[-1])
+            ):
+                # Пост старше буфера, а в базе есть посты между ними
+                return True
+            posts = sorted(rest + [post], key=_order, reverse=True)
+            self.posts = posts[:self.capacity]
+            self.complete = self.complete and len(posts) <= self.capacity
+            return True
+
+        self._change(apply)
+
+    def delete(self, post_id):
+        def apply():
+            self.posts = [post for post in self.posts if post.pk != post_id]
+            return True
+
+        self._change(apply)
+
+    def __contains__(self, post_id):
+        return any(post.pk == post_id for post in self.posts)
+
+
+_buffer = LatestPosts(CAPACITY)
+
+
+def head(count):
+    """Первые count постов главной без запросов к базе, если буфер свеж."""
+    return _buffer.get(count)[0]
+
+
+def modified():
+    """MAX(updated) всех постов."""
+    return _buffer.get(0)[1]
+
+
+def _on_commit(change):
+    """Выполняет change() после фиксации текущей транзакции."""
+    if transaction.get_connection().in_atomic_block:
+        _buffer.begin()
+    transaction.on_commit(change)
+
+
+def saved(instance, created):
+    """Вносит созданный или изменённый пост в буфер."""
+    pk, updated = instance.pk, instance.updated
+
+    def change():
+        post = None
+        # Дата публикации не меняется: пост старше буфера в нём и не
+        # появится, достаточно поднять версию и MAX(updated)
+        if created or pk in _buffer:
+            # Та же выборка колонок, что и при чтении буфера из базы
+            post = Post.objects.using(PRIMARY).for_feed().filter(
+                pk=pk).first()
+        _buffer.save(post, created, updated)
+
+    _on_commit(change)
+
+
+def deleted(instance):
+    pk = instance.pk
+    _on_commit(lambda: _buffer.delete(pk))
+
+
+def invalidate():
+    """Делает буфер устаревшим во всех процессах."""
+    bump_version([VERSION_SCOPE])
+    # Процесс, перечитавший буфер до фиксации, увидит версию ещё раз
+    transaction.on_commit(lambda: bump_version([VERSION_SCOPE]))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import stats
+from posts.models import AuthorStats, Group
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов у авторов и групп с нуля.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано групп: {Group.objects.count()}, '
+            f'авторов: {AuthorStats.objects.count()}'
+        ))
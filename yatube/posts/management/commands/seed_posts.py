@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import seeding
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими авторами, группами и постами '
+        'для профилирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--authors', type=int, default=1_000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument(
+            '--author-skew', type=float, default=1.0,
+            help='перекос постов по авторам (закон Ципфа, 0 — равномерно)',
+        )
+        parser.add_argument(
+            '--group-skew', type=float, default=1.0,
+            help='перекос постов по группам (закон Ципфа, 0 — равномерно)',
+        )
+        parser.add_argument(
+            '--no-group', type=float, default=0.2,
+            help='доля постов без группы',
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='за сколько последних дней раскидать даты публикации',
+        )
+        parser.add_argument('--batch-size', type=int,
+                            default=seeding.BATCH_SIZE)
+        parser.add_argument('--seed', type=int, help='зерно генератора')
+
+    def handle(self, *args, **options):
+        if options['authors'] < 1:
+            raise CommandError('Нужен хотя бы один автор.')
+        if options['groups'] < 0:
+            raise CommandError('--groups не может быть отрицательным.')
+        if options['posts'] < 1:
+            raise CommandError('--posts должен быть больше нуля.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        if not 0 <= options['no_group'] <= 1:
+            raise CommandError('--no-group должен быть от 0 до 1.')
+        if options['days'] < 1:
+            raise CommandError('--days должен быть больше нуля.')
+        started = time.perf_counter()
+
+        def progress(created):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{created} / {options["posts"]} постов, '
+                f'{created / elapsed:.0f} строк/с'
+            )
+
+        created = seeding.seed(
+            options['posts'],
+            options['authors'],
+            options['groups'],
+            batch_size=options['batch_size'],
+            random_seed=options['seed'],
+            progress=progress,
+            days=options['days'],
+            author_skew=options['author_skew'],
+            group_skew=options['group_skew'],
+            no_group=options['no_group'],
+        )
+        elapsed = time.perf_counter() - started
+        rows = created + options['authors'] + options['groups']
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано авторов: {options["authors"]}, '
+            f'групп: {options["groups"]}, постов: {created} '
+            f'за {elapsed:.1f} с ({rows / elapsed:.0f} строк/с)'
+        ))
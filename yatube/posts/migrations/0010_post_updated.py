@@ -0,0 +1,77 @@
+# Generated by Django 2.2.19 on 2026-10-18 04:38
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+# AddField на SQLite пересоздаёт таблицу posts_post, и её триггеры
+# полнотекстового индекса из 0009 удаляются вместе со старой таблицей
+SEARCH_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS posts_post_fts_insert AFTER INSERT "
+    "ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS posts_post_fts_delete AFTER DELETE "
+    "ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS posts_post_fts_update AFTER UPDATE OF text "
+    "ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+    "END",
+)
+
+
+def restore_search_triggers(apps, schema_editor):
+    connection = schema_editor.connection
+    if (
+        connection.vendor != 'sqlite'
+        or 'posts_post_fts' not in connection.introspection.table_names()
+    ):
+        return
+    for statement in SEARCH_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def fill_updated(apps, schema_editor):
+    # Существующие посты считаются не изменявшимися с публикации
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.update(updated=F('pub_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_search'),
+    ]
+
+    operations = [
+        # При откате RemoveField тоже пересоздаёт таблицу
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+        migrations.RunPython(fill_updated, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['updated'], name='post_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', 'updated'], name='post_group_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', 'updated'], name='post_author_updated_idx'),
+        ),
+    ]
@@ -1,28 +1,139 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from . import counters, page_cache, post_cache
 
 User = get_user_model()
 LEN_POST_FOR_STR = 15
+EXCERPT_LENGTH = 300
+
+
+def make_excerpt(text):
+    return Truncator(text).chars(EXCERPT_LENGTH)
 
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True)
     description = models.TextField()
+    posts_count = models.PositiveIntegerField(
+        'Число постов',
+        default=0,
+        editable=False
+    )
 
     def __str__(self):
         return self.title
 
 
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField('Число постов', default=0)
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+
+class PostQuerySet(models.QuerySet):
+    """Массовые операции в обход сигналов поправляют счётчики и кэши."""
+
+    # Колонки, которые выводит карточка поста в лентах
+    FEED_FIELDS = (
+        'excerpt',
+        'pub_date',
+        # Версия кэшированной карточки
+        'updated',
+        'author',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+        'group',
+        'group__slug',
+    )
+
+    def for_feed(self):
+        """Посты ленты без широких колонок автора и группы."""
+        return self.select_related('author', 'group').only(*self.FEED_FIELDS)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from . import latest, stats
+
+        objs = list(objs)
+        for post in objs:
+            post.excerpt = make_excerpt(post.text)
+        objs = super().bulk_create(objs, *args, **kwargs)
+        pairs = [(post.group_id, post.author_id) for post in objs]
+        counters.invalidate(self._scopes(pairs))
+        stats.add_posts(pairs)
+        page_cache.invalidate_all()
+        post_cache.invalidate_all()
+        latest.invalidate()
+        return objs
+
+    def update(self, **kwargs):
+        from . import latest, stats
+
+        if isinstance(kwargs.get('text'), str):
+            kwargs['excerpt'] = make_excerpt(kwargs['text'])
+        kwargs.setdefault('updated', timezone.now())
+        if not {'group', 'group_id', 'author', 'author_id'} & set(kwargs):
+            rows = super().update(**kwargs)
+            page_cache.invalidate_all()
+            post_cache.invalidate_all()
+            latest.invalidate()
+            return rows
+        pks = list(self.values_list('pk', flat=True))
+        pairs = set(self.values_list('group', 'author'))
+        rows = super().update(**kwargs)
+        moved = self.model.objects.filter(pk__in=pks)
+        pairs |= set(moved.values_list('group', 'author'))
+        counters.invalidate(self._scopes(pairs))
+        stats.recount(
+            {group_id for group_id, _ in pairs},
+            {author_id for _, author_id in pairs},
+        )
+        page_cache.invalidate_all()
+        post_cache.invalidate_all()
+        latest.invalidate()
+        return rows
+
+    @staticmethod
+    def _scopes(pairs):
+        return {
+            scope
+            for group_id, author_id in pairs
+            for scope in counters.post_scopes(group_id, author_id)
+        }
+
+
 class Post(models.Model):
     text = models.TextField(
         'Текст поста',
         help_text='Введите текст поста'
     )
+    # Начало текста для лент, полный текст нужен только странице поста
+    excerpt = models.CharField(
+        'Отрывок',
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False
+    )
     pub_date = models.DateTimeField(
         'Дата публикации',
         auto_now_add=True
     )
+    # Для условных GET: последнее изменение поста
+    updated = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
 
     author = models.ForeignKey(
         User,
@@ -40,8 +151,32 @@ class Post(models.Model):
         help_text='Группа, к которой будет относиться пост'
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         ordering = ('-pub_date',)
+        # Индексы под ленты: общая, группы и автора
+        indexes = (
+            models.Index(fields=('-pub_date', '-id'), name='post_feed_idx'),
+            models.Index(
+                fields=('group', '-pub_date'), name='post_group_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'), name='post_author_feed_idx'
+            ),
+            # MAX(updated) для валидаторов условных GET тех же лент
+            models.Index(fields=('updated',), name='post_updated_idx'),
+            models.Index(
+                fields=('group', 'updated'), name='post_group_updated_idx'
+            ),
+            models.Index(
+                fields=('author', 'updated'), name='post_author_updated_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[LEN_POST_FOR_STR]
+
+    def save(self, *args, **kwargs):
+        self.excerpt = make_excerpt(self.text)
+        super().save(*args, **kwargs)
@@ -0,0 +1,86 @@
+"""Кэш целых страниц лент для анонимных посетителей.
+
+Страница хранится вместе с версией её области (главная, группа, автор)
+и общей версией всех лент. Сигналы увеличивают версию области при
+создании, правке и удалении поста, так что новые посты видны сразу.
+Пересчёт устаревшей страницы идёт через core.cache.get_or_compute:
+её перерисовывает один процесс, а остальные пока отдают старую.
+"""
+from functools import wraps
+
+from django.utils.cache import patch_vary_headers
+
+from core.cache import bump_version, get_or_compute, get_versions
+from core.routers import primary_reads
+
+INDEX = 'index'
+ALL = 'all'
+PAGE_TIMEOUT = 60 * 60
+# Сколько ещё можно отдавать старую страницу, пока её пересчитывают
+PAGE_STALE = 60
+PAGE_PARAMS = ('page', 'cursor')
+
+
+def group_scope(slug):
+    return f'group:{slug}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def page_params(request):
+    # Пустой ?cursor= включает курсорный режим, поэтому отсутствующий
+    # параметр (None) отличается от пустого
+    return [request.GET.get(name) for name in PAGE_PARAMS]
+
+
+def page_key(request):
+    params = ':'.join(map(str, page_params(request)))
+    return f'posts:page:{request.path}:{params}'
+
+
+def page_version(scope):
+    return ':'.join(map(str, get_versions((ALL, scope), alias='pages')))
+
+
+def _cacheable(response):
+    return response.status_code == 200 and not response.cookies
+
+
+def bump(scopes):
+    """Делает устаревшими все закэшированные страницы областей."""
+    bump_version(scopes, alias='pages')
+
+
+def invalidate_all():
+    bump([ALL])
+
+
+def anonymous_page_cache(scope):
+    """Кэширует ответ view для анонимов; scope(**kwargs) - область."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            def render():
+                # Страница живёт до смены версии: отстающая реплика
+                # закрепила бы в ней уже изменённые посты
+                with primary_reads():
+                    response = view(request, *args, **kwargs)
+                patch_vary_headers(response, ('Cookie',))
+                return response
+
+            return get_or_compute(
+                page_key(request),
+                render,
+                PAGE_TIMEOUT,
+                alias='pages',
+                stale=PAGE_STALE,
+                version=page_version(scope(**kwargs)),
+                cache_if=_cacheable,
+            )
+        return wrapper
+    return decorator
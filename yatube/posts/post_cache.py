@@ -0,0 +1,77 @@
+"""Кэш объектов постов для страницы поста.
+
+Пост хранится вместе с автором, его счётчиком постов и группой.
+Правка и удаление поста удаляют его ключ, а изменения автора (имя,
+число постов) и группы увеличивают их версии: запись, сохранённая
+при других версиях, считается промахом. Массовые операции в обход
+сигналов сбрасывают все посты через общую версию ALL.
+
+Сброс выполняется сразу и ещё раз после фиксации транзакции: читатель,
+который до фиксации перечитал старую строку, мог сохранить её под уже
+новыми версиями. Промахи кэша читаются с основной базы, иначе
+отстающая реплика закрепила бы старый пост на POST_TIMEOUT.
+"""
+from django.db import transaction
+
+from core.cache import bump_version, get_cache, get_versions
+
+ALL = 'posts'
+POST_TIMEOUT = 60 * 60 * 24
+
+
+def post_key(post_id):
+    return f'posts:object:{post_id}'
+
+
+def author_scope(author_id):
+    return f'post-author:{author_id}'
+
+
+def group_scope(group_id):
+    return f'post-group:{group_id}'
+
+
+def _versions(post):
+    scopes = [ALL, author_scope(post.author_id)]
+    if post.group_id is not None:
+        scopes.append(group_scope(post.group_id))
+    return get_versions(scopes)
+
+
+def get_post(post_id, load):
+    """Пост из кэша или load(), если его нет или он устарел."""
+    cache = get_cache()
+    cached = cache.get(post_key(post_id))
+    if cached is not None:
+        versions, post = cached
+        if versions == _versions(post):
+            return post
+    post = load()
+    cache.set(post_key(post_id), (_versions(post), post), POST_TIMEOUT)
+    return post
+
+
+def _now_and_on_commit(action):
+    action()
+    transaction.on_commit(action)
+
+
+def invalidate(post_ids):
+    keys = [post_key(post_id) for post_id in post_ids]
+    _now_and_on_commit(lambda: get_cache().delete_many(keys))
+
+
+def _bump(scopes):
+    _now_and_on_commit(lambda: bump_version(scopes))
+
+
+def bump_authors(author_ids):
+    _bump([author_scope(author_id) for author_id in author_ids])
+
+
+def bump_groups(group_ids):
+    _bump([group_scope(group_id) for group_id in group_ids])
+
+
+def invalidate_all():
+    _bump([ALL])
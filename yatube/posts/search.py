@@ -0,0 +1,52 @@
+"""Полнотекстовый поиск по постам.
+
+На SQLite запрос идёт в индекс FTS5 posts_post_fts, который ведут
+триггеры из миграции 0009. На других СУБД, а также на SQLite без
+FTS5, каждое слово ищется через icontains.
+
+SQLite пересоздаёт таблицу posts_post при многих изменениях схемы,
+и триггеры индекса пропадают вместе со старой таблицей. Миграции,
+меняющие Post, должны восстанавливать их, как 0010_post_updated.
+"""
+import re
+from functools import lru_cache
+
+from django.db import connections
+
+FTS_TABLE = 'posts_post_fts'
+WORD = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=None)
+def has_index(alias):
+    connection = connections[alias]
+    return (
+        connection.vendor == 'sqlite'
+        and FTS_TABLE in connection.introspection.table_names()
+    )
+
+
+def match_expression(words):
+    """Запрос FTS5: все слова по префиксу, спецсимволы не проходят."""
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(queryset, query):
+    """Посты queryset, в тексте которых есть все слова query."""
+    words = WORD.findall(query)
+    if not words:
+        return queryset.none()
+    if not has_index(queryset.db):
+        for word in words:
+            queryset = queryset.filter(text__icontains=word)
+        return queryset
+    # RawSQL в pk__in дал бы IN ((SELECT ...)), а SQLite берёт из такой
+    # записи только первую строку подзапроса
+    table = queryset.model._meta.db_table
+    return queryset.extra(
+        where=[
+            f'"{table}"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)'
+        ],
+        params=[match_expression(words)],
+    )
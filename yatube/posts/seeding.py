@@ -0,0 +1,185 @@
+"""Быстрое наполнение базы синтетическими пользователями и постами.
+
+Нужно для профилирования и бенчмарков: посты пишутся пачками через
+bulk_create базового QuerySet, в обход сигналов и PostQuerySet, а
+счётчики и кэши пересчитываются один раз в конце.
+"""
+import random
+import re
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import models, transaction
+from django.utils import timezone
+
+from core.cache import clear_all
+
+from . import stats
+from .models import AuthorStats, Group, Post, User, make_excerpt
+
+BATCH_SIZE = 5_000
+# Сколько разных текстов генерировать: каждый пост берёт один из них
+TEXT_POOL = 1_000
+WORDS = (
+    'лев', 'зебра', 'саванна', 'жара', 'дождь', 'охота', 'прайд', 'вода',
+    'тень', 'трава', 'антилопа', 'закат', 'рассвет', 'ветер', 'пыль',
+)
+
+
+@contextmanager
+def explicit_pub_date():
+    """Позволяет задать pub_date вручную, несмотря на auto_now_add."""
+    field = Post._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def make_text(rng, words=40):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def next_number(queryset, field, prefix):
+    """Номер после наибольшего среди значений field вида prefixN.
+
+    Число записей для этого не годится: после удаления записей новые
+    имена совпали бы с уже занятыми.
+    """
+    pattern = re.compile(rf'{re.escape(prefix)}(\d+)')
+    values = queryset.filter(**{f'{field}__startswith': prefix}).values_list(
+        field, flat=True)
+    numbers = [
+        int(match.group(1))
+        for match in map(pattern.fullmatch, values.iterator()) if match
+    ]
+    return max(numbers, default=-1) + 1
+
+
+def create_users(count, batch_size=BATCH_SIZE, prefix='user'):
+    """Создаёт count авторов с профилями статистики, возвращает их id."""
+    start = next_number(User.objects.all(), 'username', prefix)
+    User.objects.bulk_create(
+        (
+            User(username=f'{prefix}{start + i}',
+                 password=UNUSABLE_PASSWORD_PREFIX)
+            for i in range(count)
+        ),
+        batch_size=batch_size,
+    )
+    # bulk_create на SQLite не возвращает id, берём последние записи
+    ids = sorted(User.objects.order_by('-pk').values_list(
+        'pk', flat=True)[:count])
+    AuthorStats.objects.bulk_create(
+        (AuthorStats(author_id=pk) for pk in ids), batch_size=batch_size
+    )
+    return ids
+
+
+def create_groups(count, batch_size=BATCH_SIZE, prefix='group'):
+    start = next_number(Group.objects.all(), 'slug', f'{prefix}-')
+    Group.objects.bulk_create(
+        (
+            Group(title=f'Группа {start + i}', slug=f'{prefix}-{start + i}',
+                  description='Сгенерированная группа')
+            for i in range(count)
+        ),
+        batch_size=batch_size,
+    )
+    return sorted(Group.objects.order_by('-pk').values_list(
+        'pk', flat=True)[:count])
+
+
+def cum_weights(count, skew):
+    """Накопленные веса закона Ципфа: k-й элемент весит 1 / k ** skew.
+
+    При skew=0 распределение равномерное.
+    """
+    weights, total = [], 0
+    for rank in range(1, count + 1):
+        total += 1 / rank ** skew
+        weights.append(total)
+    return weights
+
+
+def generate_posts(count, author_ids, group_ids, rng, days=365,
+                   author_skew=0, group_skew=0, no_group=0.0):
+    """Посты со случайными авторами, группами и датами за days дней.
+
+    author_skew и group_skew задают перекос в пользу первых авторов и
+    групп, no_group — долю постов без группы.
+    """
+    now = timezone.now()
+    seconds = days * 24 * 60 * 60
+    author_weights = cum_weights(len(author_ids), author_skew)
+    group_weights = cum_weights(len(group_ids), group_skew)
+    texts = [make_text(rng) for _ in range(min(count, TEXT_POOL))]
+    excerpts = {text: make_excerpt(text) for text in texts}
+    for _ in range(count):
+        text = rng.choice(texts)
+        group_id = None
+        if group_ids and rng.random() >= no_group:
+            group_id = rng.choices(group_ids, cum_weights=group_weights)[0]
+        yield Post(
+            text=text,
+            excerpt=excerpts[text],
+            pub_date=now - timedelta(seconds=rng.randrange(seconds)),
+            author_id=rng.choices(author_ids, cum_weights=author_weights)[0],
+            group_id=group_id,
+        )
+
+
+def create_posts(posts, batch_size=BATCH_SIZE, progress=None):
+    """Пишет посты пачками, каждая пачка в своей транзакции.
+
+    progress(created) вызывается после каждой пачки.
+    """
+    queryset = models.QuerySet(Post)
+    batch, created = [], 0
+    with explicit_pub_date():
+        for post in posts:
+            batch.append(post)
+            if len(batch) == batch_size:
+                with transaction.atomic():
+                    queryset.bulk_create(batch)
+                created += len(batch)
+                batch = []
+                if progress:
+                    progress(created)
+        if batch:
+            with transaction.atomic():
+                queryset.bulk_create(batch)
+            created += len(batch)
+            if progress:
+                progress(created)
+    return created
+
+
+def finish():
+    """Пересчитывает счётчики и сбрасывает кэши после наполнения."""
+    with transaction.atomic():
+        stats.rebuild()
+    clear_all()
+
+
+def seed(posts, authors, groups, batch_size=BATCH_SIZE, random_seed=None,
+         progress=None, **distribution):
+    """Создаёт authors авторов, groups групп и posts постов.
+
+    distribution передаётся в generate_posts. Авторы и группы
+    создаются в одной транзакции: при ошибке не остаётся авторов без
+    групп.
+    """
+    rng = random.Random(random_seed)
+    with transaction.atomic():
+        author_ids = create_users(authors, batch_size)
+        group_ids = create_groups(groups, batch_size)
+    created = create_posts(
+        generate_posts(posts, author_ids, group_ids, rng, **distribution),
+        batch_size,
+        progress,
+    )
+    finish()
+    return created
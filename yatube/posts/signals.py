@@ -0,0 +1,135 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import (
+    counters, fragments, latest, page_cache, post_cache, stats,
+)
+from .models import AuthorStats, Group, Post, User
+
+# Поля автора, которые выводятся в карточке поста
+CARD_USER_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def bump_feed_pages(post, *group_ids):
+    """Сбрасывает кэш страниц главной, автора и групп поста."""
+    slugs = Group.objects.filter(pk__in=group_ids).values_list(
+        'slug', flat=True
+    )
+    page_cache.bump(
+        [page_cache.INDEX, page_cache.profile_scope(post.author.username)]
+        + [page_cache.group_scope(slug) for slug in slugs]
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_group(sender, instance, raw, **kwargs):
+    """Запоминает группу редактируемого поста до сохранения."""
+    if raw or instance._state.adding:
+        return
+    instance._previous_group_id = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list('group', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    # id удалённых постов могут переиспользоваться, поэтому и при создании
+    fragments.invalidate([instance.pk])
+    post_cache.invalidate([instance.pk])
+    latest.saved(instance, created)
+    bump_feed_pages(
+        instance,
+        instance.group_id,
+        getattr(instance, '_previous_group_id', None),
+    )
+    if created:
+        counters.adjust(
+            counters.post_scopes(instance.group_id, instance.author_id), 1
+        )
+        stats.change_author(instance.author_id, 1)
+        stats.change_group(instance.group_id, 1)
+        post_cache.bump_authors([instance.author_id])
+        return
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if previous_group_id == instance.group_id:
+        return
+    if previous_group_id is not None:
+        counters.adjust([counters.group_scope(previous_group_id)], -1)
+    if instance.group_id is not None:
+        counters.adjust([counters.group_scope(instance.group_id)], 1)
+    stats.change_group(previous_group_id, -1)
+    stats.change_group(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    fragments.invalidate([instance.pk])
+    post_cache.invalidate([instance.pk])
+    post_cache.bump_authors([instance.author_id])
+    latest.deleted(instance)
+    bump_feed_pages(instance, instance.group_id)
+    counters.adjust(
+        counters.post_scopes(instance.group_id, instance.author_id), -1
+    )
+    stats.change_author(instance.author_id, -1)
+    stats.change_group(instance.group_id, -1)
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        AuthorStats.objects.create(author=instance)
+
+
+@receiver(pre_save, sender=User)
+def remember_card_names(sender, instance, raw, update_fields, **kwargs):
+    """Запоминает, поменялось ли имя, которое выводит карточка поста."""
+    instance._card_names_changed = False
+    if raw or instance._state.adding:
+        return
+    fields = CARD_USER_FIELDS
+    if update_fields is not None:
+        fields = fields & set(update_fields)
+    if not fields:
+        return
+    saved = User.objects.filter(pk=instance.pk).values(*fields).first()
+    instance._card_names_changed = saved is not None and any(
+        saved[field] != getattr(instance, field) for field in fields
+    )
+
+
+@receiver(post_save, sender=User)
+def drop_author_cards(sender, instance, created, **kwargs):
+    """Сбрасывает карточки постов автора при смене его имени."""
+    if created or not getattr(instance, '_card_names_changed', False):
+        return
+    fragments.bump_authors([instance.pk])
+    post_cache.bump_authors([instance.pk])
+    latest.invalidate()
+    page_cache.invalidate_all()
+
+
+def drop_group_posts(group_id):
+    """Сбрасывает карточки и кэши постов группы."""
+    fragments.bump_groups([group_id])
+    post_cache.bump_groups([group_id])
+    latest.invalidate()
+    page_cache.invalidate_all()
+
+
+@receiver(post_save, sender=Group)
+def drop_group_cards(sender, instance, created, **kwargs):
+    if created:
+        page_cache.invalidate_all()
+        return
+    drop_group_posts(instance.pk)
+
+
+@receiver(post_delete, sender=Group)
+def drop_deleted_group_cards(sender, instance, **kwargs):
+    # Посты отвязываются от группы через SET_NULL без сигналов Post
+    drop_group_posts(instance.pk)
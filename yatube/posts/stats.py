@@ -0,0 +1,89 @@
+"""Денормализованные счётчики постов у автора и группы.
+
+В отличие от кэша counters, эти счётчики хранятся в базе и
+меняются вместе с постами в той же транзакции.
+"""
+from collections import Counter
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from . import latest, post_cache
+from .models import AuthorStats, Group, Post, User
+
+
+def author_stats(author):
+    """Счётчик автора, при отсутствии строки создаётся с точным числом.
+
+    Строки нет у пользователей, созданных в обход сигнала post_save:
+    через loaddata или User.objects.bulk_create.
+    """
+    try:
+        return author.stats
+    except AuthorStats.DoesNotExist:
+        author.stats, _ = AuthorStats.objects.get_or_create(
+            author=author,
+            defaults={
+                'posts_count': Post.objects.filter(author=author).count(),
+            },
+        )
+        return author.stats
+
+
+def _changed(delta):
+    # Разошедшийся с постами счётчик не должен уходить ниже нуля:
+    # CHECK (posts_count >= 0) иначе не даст удалить пост
+    return Greatest(F('posts_count') + delta, 0)
+
+
+def change_author(author_id, delta):
+    AuthorStats.objects.filter(author_id=author_id).update(
+        posts_count=_changed(delta)
+    )
+
+
+def change_group(group_id, delta):
+    if group_id is not None:
+        Group.objects.filter(pk=group_id).update(
+            posts_count=_changed(delta)
+        )
+
+
+def add_posts(pairs):
+    """Учитывает посты, созданные в обход сигналов (bulk_create)."""
+    for author_id, total in Counter(a for _, a in pairs).items():
+        change_author(author_id, total)
+    for group_id, total in Counter(g for g, _ in pairs).items():
+        change_group(group_id, total)
+
+
+def _total(field, outer):
+    posts = Post.objects.filter(**{field: OuterRef(outer)}).order_by()
+    return Coalesce(Subquery(
+        posts.values(field).annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def recount(group_ids, author_ids):
+    """Точно пересчитывает счётчики перечисленных групп и авторов."""
+    Group.objects.filter(pk__in=group_ids).update(
+        posts_count=_total('group', 'pk')
+    )
+    missing = User.objects.filter(pk__in=author_ids, stats__isnull=True)
+    AuthorStats.objects.bulk_create(
+        AuthorStats(author_id=pk)
+        for pk in missing.values_list('pk', flat=True)
+    )
+    AuthorStats.objects.filter(author__in=author_ids).update(
+        posts_count=_total('author', 'author')
+    )
+
+
+def rebuild():
+    """Пересчитывает все счётчики с нуля."""
+    recount(
+        Group.objects.values('pk'),
+        User.objects.values('pk'),
+    )
+    post_cache.invalidate_all()
+    latest.invalidate()
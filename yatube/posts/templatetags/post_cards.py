@@ -0,0 +1,11 @@
+from django import template
+
+from posts.fragments import render_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(page_obj):
+    """Отрисованные (или взятые из кэша) карточки постов страницы."""
+    return render_cards(page_obj)
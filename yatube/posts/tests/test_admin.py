@@ -0,0 +1,68 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts.admin import TEXT_PREVIEW_LENGTH, EstimatedCountPaginator
+from posts.models import Group, Post, User
+
+CHANGELIST = reverse("admin:posts_post_changelist")
+LONG_TEXT = "Очень длинный пост " * 50
+
+
+class PostAdminTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username="Admin", email="admin@example.com", password="pass",
+        )
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug="admin-slug",
+            description="Тестовое описание",
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.admin, group=cls.group, text=LONG_TEXT)
+            for _ in range(3)
+        )
+
+    def setUp(self):
+        clear_all()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def test_changelist_skips_full_count(self):
+        """Список постов не считает COUNT(*) по всей таблице."""
+        self.admin_client.get(CHANGELIST)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(CHANGELIST)
+        self.assertEqual(response.context["cl"].result_count, 3)
+        for query in queries.captured_queries:
+            self.assertNotIn('COUNT(*) AS "__count" FROM "posts_post"',
+                             query["sql"])
+            self.assertNotIn('"posts_post"."text"', query["sql"])
+
+    def test_filtered_count_is_bounded(self):
+        """С фильтром число постов считается не дальше предела."""
+        queryset = Post.objects.filter(group=self.group)
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimatedCountPaginator(queryset, 10).count
+        self.assertEqual(count, 3)
+        self.assertIn("LIMIT", queries.captured_queries[0]["sql"])
+
+    def test_page_past_bound_is_rechecked(self):
+        """Страница за пределом оценки пересчитывается, а не теряется."""
+        queryset = Post.objects.filter(group=self.group)
+        paginator = EstimatedCountPaginator(queryset, 1)
+        paginator.COUNT_LIMIT = 2
+        self.assertEqual(paginator.count, 2)
+        self.assertEqual(len(paginator.page(3)), 1)
+        self.assertEqual(paginator.count, 3)
+
+    def test_text_is_truncated(self):
+        """Текст поста в списке обрезается."""
+        response = self.admin_client.get(CHANGELIST)
+        self.assertContains(response, LONG_TEXT[:TEXT_PREVIEW_LENGTH - 1])
+        self.assertNotContains(response, LONG_TEXT[:TEXT_PREVIEW_LENGTH + 1])
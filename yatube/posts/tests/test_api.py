@@ -0,0 +1,91 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts.models import Group, Post, User
+from posts.utils import ITEMS_PER_PAGE
+
+USERNAME = "ApiAuthor"
+ADD_USERNAME = "ApiAnother"
+GROUP_SLUG = "api-slug"
+API_INDEX = reverse("posts:api_index")
+API_GROUP = reverse("posts:api_group_list", args=[GROUP_SLUG])
+API_PROFILE = reverse("posts:api_profile", args=[ADD_USERNAME])
+
+
+class FeedApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.another_user = User.objects.create_user(username=ADD_USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, group=cls.group, text=f"Пост #{i}")
+            for i in range(ITEMS_PER_PAGE + 1)
+        )
+        cls.post = Post.objects.create(
+            author=cls.another_user, text="Пост без группы",
+        )
+
+    def setUp(self):
+        clear_all()
+        self.guest_client = Client()
+
+    def get_json(self, url):
+        response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_feeds(self):
+        """Ленты отдают свои посты и ссылки на соседние страницы."""
+        url_counts = {
+            API_INDEX: ITEMS_PER_PAGE,
+            f"{API_INDEX}?page=2": 2,
+            API_GROUP: ITEMS_PER_PAGE,
+            f"{API_GROUP}?page=2": 1,
+            API_PROFILE: 1,
+        }
+        for url, count in url_counts.items():
+            with self.subTest(url=url):
+                self.assertEqual(len(self.get_json(url)["results"]), count)
+
+        data = self.get_json(API_INDEX)
+        self.assertEqual(data["next"], f"{API_INDEX}?page=2")
+        self.assertIsNone(data["previous"])
+        self.assertEqual(data["results"][0], {
+            "id": self.post.pk,
+            "excerpt": self.post.text,
+            "pub_date": DjangoJSONEncoder().default(self.post.pub_date),
+            "author": ADD_USERNAME,
+            "group": None,
+        })
+
+    def test_cursor_pagination(self):
+        """Курсорные ссылки обходят всю ленту."""
+        url, seen = f"{API_INDEX}?cursor=", []
+        while url:
+            data = self.get_json(url)
+            seen.extend(post["id"] for post in data["results"])
+            url = data["next"]
+        self.assertEqual(
+            seen, list(Post.objects.order_by("-pub_date", "-pk").values_list(
+                "pk", flat=True))
+        )
+
+    def test_unknown_scope(self):
+        """Несуществующие группа и автор дают 404."""
+        for url in (
+            reverse("posts:api_group_list", args=["no-such-group"]),
+            reverse("posts:api_profile", args=["no-such-user"]),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.guest_client.get(url).status_code, 404)
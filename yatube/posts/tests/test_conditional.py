@@ -0,0 +1,100 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts.models import Group, Post, User
+
+USERNAME = "EtagAuthor"
+GROUP_SLUG = "etag-slug"
+INDEX = reverse("posts:index")
+GROUP = reverse("posts:group_list", args=[GROUP_SLUG])
+PROFILE = reverse("posts:profile", args=[USERNAME])
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+
+    def setUp(self):
+        clear_all()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        self.post = Post.objects.create(
+            author=self.user, text="Тестовый пост", group=self.group,
+        )
+        self.detail = reverse("posts:post_detail", args=[self.post.pk])
+        self.urls = (INDEX, GROUP, PROFILE, self.detail)
+
+    def test_not_modified(self):
+        """Повтор с ETag получает 304 без отрисовки шаблонов."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=response["ETag"]
+                )
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.templates, [])
+
+    def test_changes_update_validators(self):
+        """Правка поста меняет ETag и дату изменения."""
+        etags = {url: self.guest_client.get(url)["ETag"] for url in self.urls}
+        updated = self.post.updated
+        self.author_client.post(
+            reverse("posts:post_edit", args=[self.post.pk]),
+            data={"text": "Исправленный пост", "group": self.group.pk},
+        )
+        self.post.refresh_from_db()
+        self.assertGreater(self.post.updated, updated)
+        self.assertEqual(self.post.pub_date, Post.objects.get().pub_date)
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_no_last_modified(self):
+        """Удаление и переименование видны и по If-Modified-Since."""
+        Post.objects.create(author=self.user, text="Второй пост")
+        self.post.delete()
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = "Новое название"
+        group.save()
+        for url in (INDEX, GROUP, PROFILE):
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Last-Modified", response)
+                self.assertNotContains(response, "Тестовый пост")
+
+    def test_etag_varies_by_user(self):
+        """Гость и автор получают разные ETag."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertNotEqual(
+                    self.guest_client.get(url)["ETag"],
+                    self.author_client.get(url)["ETag"],
+                )
+
+    def test_pages_have_own_etags(self):
+        """У разных страниц ленты разные ETag."""
+        self.assertNotEqual(
+            self.guest_client.get(INDEX)["ETag"],
+            self.guest_client.get(f"{INDEX}?page=2")["ETag"],
+        )
+
+    def test_missing_author_is_not_cached(self):
+        """Профиль несуществующего автора - 404, пока он не появится."""
+        url = reverse("posts:profile", args=["Newcomer"])
+        self.assertEqual(self.guest_client.get(url).status_code, 404)
+        User.objects.create_user(username="Newcomer")
+        self.assertEqual(self.guest_client.get(url).status_code, 200)
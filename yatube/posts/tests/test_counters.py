@@ -0,0 +1,192 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts import counters
+from posts.models import AuthorStats, Group, Post, User
+
+USERNAME = "Counter"
+GROUP_SLUG = "counter-slug"
+ADD_SLUG = "counter-add-slug"
+INDEX = reverse("posts:index")
+
+
+def count_queries(queries):
+    return sum("COUNT(" in query["sql"] for query in queries)
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+        cls.another_group = Group.objects.create(
+            title="Другая группа",
+            slug=ADD_SLUG,
+            description="Тестовое описание",
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text="Тестовый пост", group=cls.group,
+        )
+
+    def setUp(self):
+        clear_all()
+        self.guest_client = Client()
+
+    def get_count(self, scope, queryset):
+        return counters.get_count(scope, queryset)
+
+    def test_count_cached_after_first_request(self):
+        """COUNT(*) выполняется только при холодном кэше."""
+        with CaptureQueriesContext(connection) as queries:
+            self.guest_client.get(INDEX)
+        self.assertEqual(count_queries(queries), 1)
+        with CaptureQueriesContext(connection) as queries:
+            self.guest_client.get(INDEX)
+        self.assertEqual(count_queries(queries), 0)
+
+    def test_signals_adjust_counters(self):
+        """Создание, перенос и удаление поста правят счётчики."""
+        group_scope = counters.group_scope(self.group.pk)
+        another_scope = counters.group_scope(self.another_group.pk)
+        author_scope = counters.author_scope(self.user.pk)
+        for scope, queryset in (
+            (counters.ALL, Post.objects.all()),
+            (group_scope, self.group.posts.all()),
+            (another_scope, self.another_group.posts.all()),
+            (author_scope, self.user.posts.all()),
+        ):
+            self.get_count(scope, queryset)
+
+        post = Post.objects.create(
+            author=self.user, text="Новый пост", group=self.group,
+        )
+        self.assertEqual(self.get_count(counters.ALL, None), 2)
+        self.assertEqual(self.get_count(group_scope, None), 2)
+        self.assertEqual(self.get_count(author_scope, None), 2)
+
+        post.group = self.another_group
+        post.save()
+        self.assertEqual(self.get_count(group_scope, None), 1)
+        self.assertEqual(self.get_count(another_scope, None), 1)
+
+        post.delete()
+        self.assertEqual(self.get_count(counters.ALL, None), 1)
+        self.assertEqual(self.get_count(another_scope, None), 0)
+
+    def test_bulk_create_invalidates(self):
+        """bulk_create сбрасывает счётчики, минуя сигналы."""
+        self.get_count(counters.ALL, Post.objects.all())
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f"Пост #{i}") for i in range(3)
+        )
+        self.assertEqual(self.get_count(counters.ALL, Post.objects.all()), 4)
+
+    def test_stale_count_is_rechecked(self):
+        """Заниженный счётчик не прячет существующие страницы."""
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f"Пост #{i}") for i in range(10)
+        )
+        counters.refresh_count(counters.ALL, Post.objects.none())
+        response = self.guest_client.get(f"{INDEX}?page=2")
+        page_obj = response.context["page_obj"]
+        self.assertEqual(page_obj.number, 2)
+        self.assertEqual(len(page_obj), 1)
+
+
+class DenormalizedCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+
+    def assertCounters(self, author_total, group_total):
+        self.user.stats.refresh_from_db()
+        self.group.refresh_from_db()
+        self.assertEqual(self.user.stats.posts_count, author_total)
+        self.assertEqual(self.group.posts_count, group_total)
+
+    def test_counters_follow_posts(self):
+        """Счётчики меняются при создании, переносе и удалении."""
+        self.author_client.post(
+            reverse("posts:post_create"),
+            data={"text": "Пост из формы", "group": self.group.pk},
+        )
+        self.assertCounters(1, 1)
+        Post.objects.bulk_create(
+            Post(author=self.user, group=self.group, text=f"Пост #{i}")
+            for i in range(3)
+        )
+        self.assertCounters(4, 4)
+        Post.objects.filter(text="Пост #0").update(group=None)
+        self.assertCounters(4, 3)
+        Post.objects.filter(group=self.group).delete()
+        self.assertCounters(1, 0)
+
+    def test_pages_do_not_count_posts(self):
+        """Профиль и пост берут число постов автора из счётчика."""
+        post = Post.objects.create(author=self.user, text="Тестовый пост")
+        profile = reverse("posts:profile", args=[USERNAME])
+        self.author_client.get(profile)
+        for url, text in (
+            (profile, "Всего постов: 1"),
+            (reverse("posts:post_detail", args=[post.pk]), "> 1 <"),
+        ):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.author_client.get(url)
+                self.assertContains(response, text)
+                self.assertEqual(count_queries(queries), 0)
+
+    def test_rebuild_command(self):
+        """Команда пересчитывает испорченные счётчики."""
+        Post.objects.create(
+            author=self.user, group=self.group, text="Тестовый пост",
+        )
+        AuthorStats.objects.update(posts_count=42)
+        Group.objects.update(posts_count=42)
+        call_command("rebuild_post_counters", stdout=StringIO())
+        self.assertCounters(1, 1)
+
+    def test_drifted_counter_does_not_block_delete(self):
+        """Заниженный счётчик не мешает удалить пост и не уходит в минус."""
+        post = Post.objects.create(
+            author=self.user, group=self.group, text="Тестовый пост",
+        )
+        AuthorStats.objects.update(posts_count=0)
+        Group.objects.update(posts_count=0)
+        post.delete()
+        self.assertCounters(0, 0)
+
+    def test_missing_author_stats_are_created(self):
+        """Автор без строки счётчика получает её с точным числом постов."""
+        post = Post.objects.create(author=self.user, text="Тестовый пост")
+        AuthorStats.objects.filter(author=self.user).delete()
+        for url, text in (
+            (reverse("posts:post_detail", args=[post.pk]), "> 1 <"),
+            (reverse("posts:profile", args=[USERNAME]), "Всего постов: 1"),
+        ):
+            with self.subTest(url=url):
+                self.assertContains(self.author_client.get(url), text)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).posts_count, 1
+        )
@@ -0,0 +1,78 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts import fragments
+from posts.models import Group, Post, User
+
+USERNAME = "CardAuthor"
+GROUP_SLUG = "card-slug"
+INDEX = reverse("posts:index")
+
+
+class PostCardCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+
+    def setUp(self):
+        clear_all()
+        fragments.stats.clear()
+        self.guest_client = Client()
+        self.post = Post.objects.create(
+            author=self.user, text="Тестовый пост", group=self.group,
+        )
+
+    def test_second_render_hits_cache(self):
+        """Повторная лента собирается из кэшированных карточек."""
+        self.guest_client.get(INDEX)
+        self.assertEqual(fragments.stats["misses"], 1)
+        fragments.render_cards(Post.objects.all())
+        self.assertEqual(fragments.stats["hits"], 1)
+
+    def test_edit_invalidates_card(self):
+        """Изменённый пост перерисовывается."""
+        fragments.render_cards(Post.objects.all())
+        self.post.text = "Новый текст"
+        self.post.save()
+        (card,) = fragments.render_cards(Post.objects.all())
+        self.assertIn("Новый текст", card)
+
+    def test_bulk_update_invalidates_card(self):
+        """Массовая правка в обход сигналов тоже перерисовывает карточку."""
+        self.guest_client.get(INDEX)
+        Post.objects.filter(pk=self.post.pk).update(text="Новый текст")
+        self.assertContains(self.guest_client.get(INDEX), "Новый текст")
+
+    def test_author_rename_invalidates_card(self):
+        """Смена имени автора сбрасывает его карточки."""
+        fragments.render_cards(Post.objects.all())
+        self.user.first_name = "Лев"
+        self.user.last_name = "Толстой"
+        self.user.save()
+        (card,) = fragments.render_cards(Post.objects.all())
+        self.assertIn("Лев Толстой", card)
+
+    def test_other_user_changes_keep_cards(self):
+        """Сохранение автора без смены имени не сбрасывает карточки."""
+        fragments.render_cards(Post.objects.all())
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password("new-password")
+        user.save()
+        fragments.render_cards(Post.objects.all())
+        self.assertEqual(fragments.stats["hits"], 1)
+
+    def test_group_delete_invalidates_card(self):
+        """Удаление группы убирает ссылку на неё из карточек и ленты."""
+        group = Group.objects.create(title="Удаляемая", slug="deleted-slug")
+        Post.objects.filter(pk=self.post.pk).update(group=group)
+        group_url = reverse("posts:group_list", args=[group.slug])
+        self.assertContains(self.guest_client.get(INDEX), group_url)
+        group.delete()
+        self.assertNotContains(self.guest_client.get(INDEX), group_url)
@@ -0,0 +1,134 @@
+import tempfile
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts import latest
+from posts.models import Group, Post, User
+from posts.utils import ITEMS_PER_PAGE
+
+USERNAME = "LatestAuthor"
+GROUP_SLUG = "latest-slug"
+INDEX = reverse("posts:index")
+CURSOR_INDEX = f"{INDEX}?cursor="
+
+
+class LatestPostsTest(TransactionTestCase):
+    # Буфер меняется после фиксации транзакции, поэтому тесты
+    # работают без обёртки TestCase в одну незафиксированную транзакцию
+
+    def setUp(self):
+        clear_all()
+        self.user = User.objects.create_user(username=USERNAME)
+        self.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        self.posts = [
+            Post.objects.create(author=self.user, text=f"Пост #{i}")
+            for i in range(ITEMS_PER_PAGE + 1)
+        ]
+        for url in (INDEX, CURSOR_INDEX):
+            self.guest_client.get(url)
+
+    def test_new_post_without_queries(self):
+        """Новый пост попадает на первую страницу без запросов к базе."""
+        self.author_client.post(
+            reverse("posts:post_create"),
+            data={"text": "Свежий пост", "group": self.group.pk},
+        )
+        for url in (INDEX, CURSOR_INDEX):
+            with self.subTest(url=url):
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(url)
+                self.assertContains(response, "Свежий пост")
+                self.assertContains(response, GROUP_SLUG)
+                self.assertEqual(
+                    len(response.context["page_obj"]), ITEMS_PER_PAGE
+                )
+
+    def test_edit_and_delete_without_queries(self):
+        """Правка и удаление поста поправляют буфер на месте."""
+        post = self.posts[-1]
+        self.author_client.post(
+            reverse("posts:post_edit", args=[post.pk]),
+            data={"text": "Исправленный пост", "group": ""},
+        )
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(INDEX)
+        self.assertContains(response, "Исправленный пост")
+
+        post.delete()
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(INDEX)
+        self.assertNotContains(response, "Исправленный пост")
+        self.assertEqual(len(response.context["page_obj"]), ITEMS_PER_PAGE)
+
+    def test_rolled_back_post_is_not_shown(self):
+        """Пост из откатившейся транзакции не остаётся в буфере."""
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Post.objects.create(author=self.user, text="Откатившийся")
+                raise RuntimeError
+        self.assertNotIn(
+            "Откатившийся",
+            [post.excerpt for post in latest.head(ITEMS_PER_PAGE)],
+        )
+        self.assertEqual(latest.head(ITEMS_PER_PAGE), self.posts[:0:-1])
+
+    def test_change_reaches_other_process(self):
+        """Буфер другого процесса перечитывается после чужого изменения."""
+        other = latest.LatestPosts(latest.CAPACITY)
+        other.get(ITEMS_PER_PAGE)
+        post = Post.objects.create(author=self.user, text="Свежий пост")
+        posts, _ = other.get(ITEMS_PER_PAGE)
+        self.assertEqual(posts[0], post)
+
+    def test_buffer_expires(self):
+        """Буфер перечитывается по истечении BUFFER_TIMEOUT."""
+        other = latest.LatestPosts(latest.CAPACITY)
+        other.get(ITEMS_PER_PAGE)
+        with self.assertNumQueries(0):
+            other.get(ITEMS_PER_PAGE)
+        other.loaded = time.monotonic() - latest.BUFFER_TIMEOUT
+        with self.assertNumQueries(2):
+            other.get(ITEMS_PER_PAGE)
+
+    def test_foreign_change_reloads_buffer(self):
+        """Изменение версии другим процессом заставляет перечитать буфер."""
+        reloads = latest.stats["reloads"]
+        latest.invalidate()
+        self.assertEqual(latest.head(ITEMS_PER_PAGE), self.posts[:0:-1])
+        self.assertEqual(latest.stats["reloads"], reloads + 1)
+        with self.assertNumQueries(0):
+            latest.head(ITEMS_PER_PAGE)
+
+    def test_file_cache_reloads_after_change(self):
+        """Без атомарного incr буфер перечитывается после изменения."""
+        with tempfile.TemporaryDirectory() as location:
+            caches = dict(settings.CACHES, default={
+                "BACKEND":
+                    "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": location,
+            })
+            with override_settings(CACHES=caches):
+                latest.head(ITEMS_PER_PAGE)
+                reloads = latest.stats["reloads"]
+                post = Post.objects.create(author=self.user, text="Свежий")
+                self.assertEqual(latest.head(ITEMS_PER_PAGE)[0], post)
+                self.assertEqual(latest.stats["reloads"], reloads + 1)
+
+    def test_other_pages_use_database(self):
+        """Остальные страницы главной читаются из базы."""
+        response = self.guest_client.get(f"{INDEX}?page=2")
+        self.assertEqual(
+            list(response.context["page_obj"]), [self.posts[0]]
+        )
@@ -1,6 +1,6 @@
 ﻿from django.contrib.auth import get_user_model
 from django.test import TestCase
-from ..models import Group, Post, LEN_POST_FOR_STR
+from ..models import EXCERPT_LENGTH, Group, Post, LEN_POST_FOR_STR
 
 User = get_user_model()
 
@@ -55,3 +55,16 @@ class PostModelTest(TestCase):
             with self.subTest(field=field):
                 self.assertEqual(
                     post._meta.get_field(field).verbose_name, expected_value)
+
+    def test_excerpt(self):
+        """Отрывок поста обновляется при сохранении и bulk_create."""
+        post = PostModelTest.post
+        self.assertEqual(post.excerpt, post.text)
+        post.text = 'Очень длинный пост. ' * 100
+        post.save()
+        self.assertEqual(len(post.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(post.text.startswith(post.excerpt[:-1]))
+        (bulk_post,) = Post.objects.bulk_create(
+            [Post(author=self.user, text='Пост bulk_create')]
+        )
+        self.assertEqual(bulk_post.excerpt, 'Пост bulk_create')
@@ -0,0 +1,91 @@
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from core.cache import clear_all, get_cache
+from posts.conditional import modified_key
+from posts.models import Group, Post, User
+from posts.page_cache import INDEX as INDEX_SCOPE
+from posts.page_cache import page_key
+
+USERNAME = "PageAuthor"
+GROUP_SLUG = "page-slug"
+INDEX = reverse("posts:index")
+GROUP = reverse("posts:group_list", args=[GROUP_SLUG])
+PROFILE = reverse("posts:profile", args=[USERNAME])
+MODIFIED_KEY = modified_key(INDEX_SCOPE)
+
+
+def page_key_for(url):
+    return page_key(RequestFactory().get(url))
+
+
+class AnonymousPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+
+    def setUp(self):
+        clear_all()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        self.post = Post.objects.create(
+            author=self.user, text="Тестовый пост", group=self.group,
+        )
+
+    def test_anonymous_pages_are_cached(self):
+        """Повторный анонимный запрос не ходит в базу."""
+        for url in (INDEX, GROUP, PROFILE, f"{INDEX}?page=1"):
+            with self.subTest(url=url):
+                self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(url)
+                self.assertContains(response, "Тестовый пост")
+
+    def test_authorized_pages_are_not_cached(self):
+        """Авторизованный пользователь всегда получает свежую страницу."""
+        self.author_client.get(INDEX)
+        response = self.author_client.get(INDEX)
+        self.assertIsNotNone(response.context)
+
+    def test_post_changes_invalidate_pages(self):
+        """Создание, правка и удаление поста видны анонимам сразу."""
+        self.guest_client.get(INDEX)
+        self.guest_client.get(GROUP)
+        self.author_client.post(
+            reverse("posts:post_create"),
+            data={"text": "Свежий пост", "group": self.group.pk},
+        )
+        for url in (INDEX, GROUP, PROFILE):
+            with self.subTest(url=url):
+                self.assertContains(self.guest_client.get(url), "Свежий пост")
+
+        self.author_client.post(
+            reverse("posts:post_edit", args=[self.post.pk]),
+            data={"text": "Исправленный пост", "group": ""},
+        )
+        self.assertContains(self.guest_client.get(INDEX), "Исправленный")
+        self.assertNotContains(self.guest_client.get(GROUP), "Исправленный")
+
+        Post.objects.filter(text="Свежий пост").delete()
+        self.assertNotContains(self.guest_client.get(GROUP), "Свежий пост")
+
+    def test_stale_page_served_while_rebuilding(self):
+        """Пока страницу пересчитывает другой процесс, отдаётся старая."""
+        self.guest_client.get(INDEX)
+        Post.objects.create(author=self.user, text="Свежий пост")
+        # Вместе со страницей пересчитываются и её валидаторы для ETag
+        locks = (f"{page_key_for(INDEX)}:lock", f"{MODIFIED_KEY}:lock")
+        for lock in locks:
+            get_cache("pages").add(lock, 1)
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(INDEX)
+        self.assertNotContains(response, "Свежий пост")
+        get_cache("pages").delete_many(locks)
+        self.assertContains(self.guest_client.get(INDEX), "Свежий пост")
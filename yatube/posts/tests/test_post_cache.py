@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from core.cache import clear_all, get_cache
+from posts.conditional import load_post
+from posts.models import Group, Post, User
+from posts.post_cache import post_key
+
+USERNAME = "DetailAuthor"
+
+
+class PostDetailCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug="detail-slug",
+            description="Тестовое описание",
+        )
+
+    def setUp(self):
+        clear_all()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        self.post = Post.objects.create(
+            author=self.user, text="Тестовый пост", group=self.group,
+        )
+        self.url = reverse("posts:post_detail", args=[self.post.pk])
+
+    def test_single_query_then_cache(self):
+        """Пост с автором, счётчиком и группой - один запрос, потом кэш."""
+        with self.assertNumQueries(1):
+            response = self.guest_client.get(self.url)
+        self.assertContains(response, "Тестовая группа")
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.url)
+
+    def test_changes_invalidate_cached_post(self):
+        """Правка, новый пост автора и смена группы видны сразу."""
+        self.guest_client.get(self.url)
+        self.author_client.post(
+            reverse("posts:post_edit", args=[self.post.pk]),
+            data={"text": "Исправленный пост", "group": self.group.pk},
+        )
+        self.assertContains(self.guest_client.get(self.url), "Исправленный")
+
+        Post.objects.create(author=self.user, text="Ещё пост")
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context["post"].author.stats.posts_count, 2)
+
+        self.group.title = "Новое название"
+        self.group.save()
+        self.assertContains(self.guest_client.get(self.url), "Новое название")
+
+        Post.objects.filter(pk=self.post.pk).update(text="Массовая правка")
+        self.assertContains(self.guest_client.get(self.url), "Массовая правка")
+
+    def test_deleted_post_is_not_served(self):
+        """Удалённый пост не отдаётся из кэша."""
+        self.guest_client.get(self.url)
+        self.post.delete()
+        self.assertEqual(self.guest_client.get(self.url).status_code, 404)
+
+
+class PostCacheCommitTest(TransactionTestCase):
+    def test_reload_before_commit_is_dropped(self):
+        """Пост, закэшированный до фиксации правки, сбрасывается после неё."""
+        clear_all()
+        user = User.objects.create_user(username=USERNAME)
+        post = Post.objects.create(author=user, text="Тестовый пост")
+        with transaction.atomic():
+            post.text = "Исправленный пост"
+            post.save()
+            # Читатель перечитал пост уже после сброса ключа
+            load_post(post.pk)
+            self.assertIsNotNone(get_cache().get(post_key(post.pk)))
+        self.assertIsNone(get_cache().get(post_key(post.pk)))
@@ -0,0 +1,58 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts.models import Group, Post, User
+
+USERNAME = "QueryAuthor"
+GROUP_SLUG = "query-slug"
+INDEX = reverse("posts:index")
+GROUP = reverse("posts:group_list", args=[GROUP_SLUG])
+PROFILE = reverse("posts:profile", args=[USERNAME])
+# Широкие колонки, которые не выводятся в лентах
+UNUSED_COLUMNS = (
+    '"posts_post"."text"',
+    '"description"',
+    '"password"',
+    '"last_login"',
+    '"email"',
+)
+
+
+class FeedColumnsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title="Тестовая группа",
+            slug=GROUP_SLUG,
+            description="Тестовое описание",
+        )
+        Post.objects.create(
+            author=cls.user, text="Тестовый пост", group=cls.group,
+        )
+
+    def setUp(self):
+        clear_all()
+        self.guest_client = Client()
+
+    def test_feeds_load_only_used_columns(self):
+        """Запрос постов ленты не тянет неиспользуемые колонки."""
+        for url in (INDEX, GROUP, PROFILE):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    self.assertContains(
+                        self.guest_client.get(url), "Тестовый пост"
+                    )
+                feed_queries = [
+                    query["sql"] for query in queries.captured_queries
+                    if 'FROM "posts_post"' in query["sql"]
+                    and "COUNT(" not in query["sql"]
+                    and "MAX(" not in query["sql"]
+                ]
+                self.assertEqual(len(feed_queries), 1)
+                for column in UNUSED_COLUMNS:
+                    self.assertNotIn(column, feed_queries[0])
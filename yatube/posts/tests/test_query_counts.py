@@ -0,0 +1,87 @@
+from itertools import cycle
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts.models import Group, Post, User
+from posts.utils import ITEMS_PER_PAGE
+
+AUTHORS = 3
+GROUPS = 3
+
+
+class QueryCountTest(TestCase):
+    """Число запросов каждой страницы не зависит от числа постов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [
+            User.objects.create_user(
+                username=f"Author{i}", first_name="Имя", last_name="Фамилия",
+            )
+            for i in range(AUTHORS)
+        ]
+        cls.groups = [
+            Group.objects.create(
+                title=f"Группа {i}",
+                slug=f"group-{i}",
+                description="Тестовое описание",
+            )
+            for i in range(GROUPS)
+        ]
+        cls.post = Post.objects.create(
+            author=cls.authors[0], group=cls.groups[0], text="Тестовый пост",
+        )
+        author = cls.authors[0]
+        group = cls.groups[0]
+        cls.urls = (
+            reverse("posts:index"),
+            reverse("posts:group_list", args=[group.slug]),
+            reverse("posts:profile", args=[author.username]),
+            reverse("posts:search") + "?q=пост",
+            reverse("posts:post_detail", args=[cls.post.pk]),
+            reverse("posts:post_create"),
+            reverse("posts:post_edit", args=[cls.post.pk]),
+            reverse("posts:api_index"),
+            reverse("posts:api_group_list", args=[group.slug]),
+            reverse("posts:api_profile", args=[author.username]),
+        )
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.authors[0])
+
+    def seed(self, count):
+        """Добавляет count постов, разложенных по всем авторам и группам."""
+        pairs = cycle(
+            (author, group)
+            for author in self.authors for group in self.groups + [None]
+        )
+        Post.objects.bulk_create(
+            Post(author=author, group=group, text=f"Пост #{i}")
+            for i, (author, group) in zip(range(count), pairs)
+        )
+
+    def count_queries(self, url):
+        clear_all()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.author_client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_constant(self):
+        """Рост числа постов не добавляет запросов на строку."""
+        self.seed(1)
+        # Первый запрос прогревает кэши процесса, например posts.search
+        for url in self.urls:
+            self.count_queries(url)
+        few = {url: self.count_queries(url) for url in self.urls}
+        self.seed(ITEMS_PER_PAGE * AUTHORS * (GROUPS + 1))
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.count_queries(url), few[url])
@@ -0,0 +1,78 @@
+from django.contrib.admin.sites import site
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from core.cache import clear_all
+from posts.models import Post, User
+from posts.search import has_index, search
+from posts.utils import ITEMS_PER_PAGE
+
+USERNAME = "SearchAuthor"
+SEARCH = reverse("posts:search")
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.lion = Post.objects.create(
+            author=cls.user, text="Лев вышел на охоту в саванне",
+        )
+        cls.zebra = Post.objects.create(
+            author=cls.user, text="Зебры пьют воду",
+        )
+
+    def setUp(self):
+        clear_all()
+        self.guest_client = Client()
+
+    def found(self, query):
+        return set(search(Post.objects.all(), query))
+
+    def test_index_is_used(self):
+        """На SQLite поиск идёт по индексу FTS5."""
+        self.assertTrue(has_index("default"))
+
+    def test_search_words(self):
+        """Находятся посты со всеми словами запроса, по префиксу."""
+        self.assertEqual(self.found("лев охот"), {self.lion})
+        self.assertEqual(self.found("ЗЕБРЫ"), {self.zebra})
+        self.assertEqual(self.found("лев зебры"), set())
+        self.assertEqual(self.found('" OR * -'), set())
+
+    def test_index_follows_changes(self):
+        """Индекс обновляется при правке, массовых операциях и удалении."""
+        self.lion.text = "Лев спит"
+        self.lion.save()
+        self.assertEqual(self.found("охота"), set())
+        self.assertEqual(self.found("спит"), {self.lion})
+        Post.objects.bulk_create([Post(author=self.user, text="Гиена спит")])
+        self.assertEqual(len(self.found("спит")), 2)
+        Post.objects.filter(text__contains="Гиена").update(text="Гиена ест")
+        Post.objects.filter(pk=self.lion.pk).delete()
+        self.assertEqual(self.found("спит"), set())
+
+    def test_view_paginates_and_keeps_query(self):
+        """Выдача разбита на страницы, ссылки сохраняют запрос."""
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f"Лев #{i}")
+            for i in range(ITEMS_PER_PAGE)
+        )
+        response = self.guest_client.get(SEARCH, {"q": "лев"})
+        self.assertEqual(len(response.context["page_obj"]), ITEMS_PER_PAGE)
+        self.assertContains(response, "?q=%D0%BB%D0%B5%D0%B2&amp;page=2")
+        response = self.guest_client.get(SEARCH, {"q": "лев", "page": 2})
+        self.assertEqual(len(response.context["page_obj"]), 1)
+        self.assertEqual(
+            len(self.guest_client.get(SEARCH).context["page_obj"]), 0
+        )
+
+    def test_admin_search_uses_index(self):
+        """Поиск в админке идёт через тот же индекс."""
+        admin = site._registry[Post]
+        queryset, use_distinct = admin.get_search_results(
+            RequestFactory().get("/"), Post.objects.all(), "зебры"
+        )
+        self.assertEqual(set(queryset), {self.zebra})
+        self.assertIn("posts_post_fts", str(queryset.query))
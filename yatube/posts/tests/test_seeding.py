@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from posts import seeding
+from posts.models import AuthorStats, Group, Post, User
+
+
+class SeedingTest(TestCase):
+    def test_seed_keeps_counters_consistent(self):
+        """Сгенерированные посты учтены в счётчиках авторов и групп."""
+        created = seeding.seed(50, authors=4, groups=3, batch_size=7,
+                               random_seed=1)
+        self.assertEqual(created, 50)
+        self.assertEqual(Post.objects.count(), 50)
+        self.assertEqual(AuthorStats.objects.count(), User.objects.count())
+        for group in Group.objects.annotate(total=Count("posts")):
+            with self.subTest(group=group.slug):
+                self.assertEqual(group.posts_count, group.total)
+        for user in User.objects.annotate(total=Count("posts")):
+            with self.subTest(user=user.username):
+                self.assertEqual(user.stats.posts_count, user.total)
+
+    def test_pub_dates_are_spread(self):
+        """Даты публикации раскиданы по периоду, а не равны now()."""
+        seeding.seed(20, authors=2, groups=1, days=30, random_seed=1)
+        self.assertGreater(
+            Post.objects.values("pub_date").distinct().count(), 1
+        )
+        self.assertTrue(Post._meta.get_field("pub_date").auto_now_add)
+
+    def test_distribution(self):
+        """Перекос отдаёт больше постов первым авторам и группам."""
+        seeding.seed(300, authors=5, groups=5, random_seed=1,
+                     author_skew=2, group_skew=2, no_group=0.5)
+        authors = list(User.objects.order_by("pk").values_list(
+            "stats__posts_count", flat=True))
+        groups = list(Group.objects.order_by("pk").values_list(
+            "posts_count", flat=True))
+        self.assertEqual(authors[0], max(authors))
+        self.assertEqual(groups[0], max(groups))
+        self.assertTrue(Post.objects.filter(group=None).exists())
+
+    def test_rerun_after_delete(self):
+        """Повторное наполнение после удалений не повторяет имена."""
+        seeding.seed(5, authors=3, groups=2)
+        User.objects.order_by("pk").first().delete()
+        Group.objects.order_by("pk").first().delete()
+        seeding.seed(5, authors=3, groups=2)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Group.objects.count(), 3)
+
+    def test_command_reports_rate(self):
+        """Команда создаёт посты пачками и сообщает скорость."""
+        out = StringIO()
+        call_command("seed_posts", posts=30, authors=3, groups=2,
+                     batch_size=10, seed=1, stdout=out)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(out.getvalue().count("строк/с"), 4)
+
+    def test_command_validates_options(self):
+        """Неверные параметры отклоняются со своим сообщением."""
+        for options, message in (
+            ({"authors": 0}, "автор"),
+            ({"posts": -1}, "--posts"),
+            ({"posts": 0}, "--posts"),
+            ({"batch_size": 0}, "--batch-size"),
+            ({"groups": -1}, "--groups"),
+            ({"days": 0}, "--days"),
+            ({"days": -1}, "--days"),
+        ):
+            with self.subTest(options=options):
+                with self.assertRaisesMessage(CommandError, message):
+                    call_command("seed_posts", stdout=StringIO(), **options)
+                self.assertFalse(User.objects.exists())
@@ -0,0 +1,111 @@
+import base64
+
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post, User
+from posts.utils import (
+    ITEMS_PER_PAGE, NEXT, CountingPaginator, CursorPaginator, decode_cursor,
+    encode_cursor,
+)
+
+USERNAME = "CursorAuthor"
+INDEX = reverse("posts:index")
+POSTS_COUNT = ITEMS_PER_PAGE * 2 + 3
+
+
+class CursorPaginationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f"Пост #{i}")
+            for i in range(POSTS_COUNT)
+        )
+        # Одинаковые даты проверяют разрешение ничьих по id
+        first = Post.objects.order_by("pk").first()
+        Post.objects.update(pub_date=first.pub_date)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_cursor_roundtrip(self):
+        """Токен курсора декодируется в исходный ключ."""
+        post = Post.objects.first()
+        self.assertEqual(
+            decode_cursor(encode_cursor(post, NEXT)),
+            (NEXT, post.pub_date, post.pk),
+        )
+        self.assertIsNone(decode_cursor("не-курсор"))
+        huge = base64.urlsafe_b64encode(
+            f"{NEXT}|{post.pub_date.isoformat()}|{10 ** 20}".encode()
+        ).decode()
+        self.assertIsNone(decode_cursor(huge))
+        response = self.guest_client.get(f"{INDEX}?cursor={huge}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_walk_forward_and_back(self):
+        """Проход вперёд и назад покрывает ленту без пропусков."""
+        paginator = CursorPaginator(Post.objects.all(), ITEMS_PER_PAGE)
+        pages = [paginator.get_page(None)]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        seen = [post.pk for page in pages for post in page]
+        expected = list(
+            Post.objects.order_by("-pub_date", "-pk").values_list(
+                "pk", flat=True)
+        )
+        self.assertEqual(seen, expected)
+        self.assertFalse(pages[0].has_previous())
+
+        back = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual(list(back), list(pages[-2]))
+
+    def test_view_does_not_count(self):
+        """В курсорном режиме лента не выполняет COUNT(*)."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(f"{INDEX}?cursor=")
+        page_obj = response.context["page_obj"]
+        self.assertEqual(len(page_obj), ITEMS_PER_PAGE)
+        self.assertTrue(page_obj.has_next())
+        for query in queries.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn("OFFSET", query["sql"])
+        self.assertContains(response, f"?cursor={page_obj.next_cursor}")
+
+
+class ElidedPageRangeTest(SimpleTestCase):
+    def get_page(self, pages, number):
+        paginator = CountingPaginator(
+            range(pages * ITEMS_PER_PAGE), ITEMS_PER_PAGE, scope="test"
+        )
+        paginator.count = pages * ITEMS_PER_PAGE
+        return paginator.page(number)
+
+    def render(self, pages, number):
+        return render_to_string(
+            "posts/includes/paginator.html",
+            {"page_obj": self.get_page(pages, number)},
+        )
+
+    def test_elided_range(self):
+        """Номера страниц сокращаются по краям и вокруг текущей."""
+        ellipsis = CountingPaginator.ELLIPSIS
+        self.assertEqual(
+            list(self.get_page(100, 50).elided_page_range),
+            [1, ellipsis, 48, 49, 50, 51, 52, ellipsis, 100],
+        )
+        self.assertEqual(
+            list(self.get_page(7, 1).elided_page_range), list(range(1, 8))
+        )
+
+    def test_rendered_size_is_constant(self):
+        """Размер навигации не зависит от общего числа страниц."""
+        small = self.render(20, 10)
+        huge = self.render(10_000, 5_000)
+        self.assertEqual(small.count("<li"), huge.count("<li"))
+        self.assertLess(len(huge) - len(small), 100)
@@ -4,6 +4,7 @@ from django import forms
 from django.test import Client, TestCase
 from django.urls import reverse
 
+from core.cache import clear_all
 from posts.utils import ITEMS_PER_PAGE
 from posts.models import Group, Post, User
 
@@ -50,6 +51,10 @@ class PostViewsTest(TestCase):
         cls.POST = reverse("posts:post_detail", args=[cls.post.id])
         cls.EDIT_POST = reverse("posts:post_edit", args=[cls.post.id])
 
+    def setUp(self):
+        # Откат транзакции теста не виден кэшам и буферу последних постов
+        clear_all()
+
     def test_pages_uses_correct_template(self):
         """URL-адрес использует соответствующий шаблон."""
         # Шаблоны по адресам
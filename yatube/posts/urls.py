@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'posts'
 
@@ -13,6 +13,9 @@ urlpatterns = [
     # Профайл пользователя
     path('profile/<str:username>/', views.profile, name='profile'),
 
+    # Поиск по постам
+    path('search/', views.search, name='search'),
+
     # Просмотр записи
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
 
@@ -21,4 +24,9 @@ urlpatterns = [
 
     # Редактировать пост
     path('posts/<post_id>/edit/', views.post_edit, name='post_edit'),
+
+    # JSON-версии лент
+    path('api/posts/', api.index, name='api_index'),
+    path('api/group/<slug:slug>/', api.group_posts, name='api_group_list'),
+    path('api/profile/<str:username>/', api.profile, name='api_profile'),
 ]
@@ -1,11 +1,227 @@
-from django.core.paginator import Paginator
+import base64
+import binascii
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from . import counters
 
 
 ITEMS_PER_PAGE = 10
+CURSOR_PARAM = 'cursor'
+NEXT = 'n'
+PREVIOUS = 'p'
+# Границы 64-битного целого: больший id база не примет
+MIN_ID, MAX_ID = -2 ** 63, 2 ** 63 - 1
+
+
+def encode_cursor(post, direction):
+    """Упаковывает ключ (pub_date, id) поста в непрозрачный токен.
+
+    post может быть объектом Post или строкой .values() с pub_date и id.
+    """
+    if isinstance(post, dict):
+        pub_date, pk = post['pub_date'], post['id']
+    else:
+        pub_date, pk = post.pub_date, post.pk
+    raw = f'{direction}|{pub_date.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Распаковывает токен курсора, для битого токена возвращает None."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date, pk = parse_datetime(pub_date), int(pk)
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+    if (
+        direction not in (NEXT, PREVIOUS) or pub_date is None
+        or not MIN_ID <= pk <= MAX_ID
+    ):
+        return None
+    return direction, pub_date, pk
+
+
+class CursorPage(Sequence):
+    """Страница ленты без номера: только ссылки вперёд и назад."""
+
+    cursor_mode = True
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (pub_date, id) без COUNT(*) и OFFSET.
+
+    head(count), если задан, отдаёт первые count постов ленты вместо
+    запроса к базе.
+    """
+
+    def __init__(self, object_list, per_page, head=None):
+        self.object_list = object_list.order_by('-pub_date', '-pk')
+        self.per_page = per_page
+        self.head = head
+
+    def get_page(self, token):
+        cursor = decode_cursor(token) if token else None
+        if cursor is None:
+            if self.head is not None:
+                rows = self.head(self.per_page + 1)
+            else:
+                rows = list(self.object_list[:self.per_page + 1])
+            return self._page(
+                rows[:self.per_page],
+                has_next=len(rows) > self.per_page,
+                has_previous=False,
+            )
+        direction, pub_date, pk = cursor
+        if direction == NEXT:
+            rows = list(self.object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )[:self.per_page + 1])
+            return self._page(
+                rows[:self.per_page],
+                has_next=len(rows) > self.per_page,
+                has_previous=True,
+            )
+        rows = list(self.object_list.filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+        ).reverse()[:self.per_page + 1])
+        return self._page(
+            rows[:self.per_page][::-1],
+            has_next=True,
+            has_previous=len(rows) > self.per_page,
+        )
+
+    def _page(self, rows, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(rows[-1], NEXT)
+        if rows and has_previous:
+            previous_cursor = encode_cursor(rows[0], PREVIOUS)
+        return CursorPage(rows, next_cursor, previous_cursor)
+
+
+class FeedPage(Page):
+
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(self.number)
+
+
+class CountingPaginator(Paginator):
+    """Paginator, который берёт число постов из кэша счётчиков.
+
+    Счётчик приблизительный, поэтому выход за его пределы
+    перепроверяется точным COUNT(*). Без scope (например, для выдачи
+    поиска) число постов всегда считается точно. head(count), если
+    задан, отдаёт посты первой страницы вместо запроса к базе.
+    """
+
+    ELLIPSIS = '…'
+
+    def __init__(self, object_list, per_page, scope, head=None):
+        super().__init__(object_list, per_page)
+        self.scope = scope
+        self.exact = scope is None
+        self.head = head
+
+    @cached_property
+    def count(self):
+        if self.scope is None:
+            return self.object_list.count()
+        return counters.get_count(self.scope, self.object_list)
+
+    def refresh(self):
+        self.__dict__.pop('num_pages', None)
+        self.count = counters.refresh_count(self.scope, self.object_list)
+        self.exact = True
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.exact or int(number) < 1:
+                raise
+        self.refresh()
+        return super().validate_number(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if number == 1 and self.head is not None:
+            return self._get_page(self.head(self.per_page), number, self)
+        bottom = (number - 1) * self.per_page
+        page = self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self
+        )
+        if number > 1 and not page.object_list and not self.exact:
+            # Счётчик завысил число страниц: страница уже пуста
+            self.refresh()
+            return self.get_page(number)
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+    def get_elided_page_range(self, number, on_each_side=2, on_ends=1):
+        """Номера страниц вокруг текущей и по краям, пропуски - ELLIPSIS.
+
+        Длина диапазона не зависит от общего числа страниц.
+        """
+        if self.num_pages <= (on_each_side + on_ends) * 2 + 1:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
 
 
-def pagination(request, posts):
-    paginator = Paginator(posts, ITEMS_PER_PAGE)
+def pagination(request, posts, cursor=None, scope=counters.ALL, head=None):
+    if cursor is None:
+        cursor = (
+            settings.POSTS_CURSOR_PAGINATION or CURSOR_PARAM in request.GET
+        )
+    if cursor:
+        paginator = CursorPaginator(posts, ITEMS_PER_PAGE, head)
+        return paginator.get_page(request.GET.get(CURSOR_PARAM))
+    paginator = CountingPaginator(posts, ITEMS_PER_PAGE, scope, head)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
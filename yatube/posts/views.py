@@ -1,13 +1,30 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from .models import Post, Group, User
 from .forms import PostForm
+from .conditional import (
+    group_condition, index_condition, load_post, post_condition,
+    profile_condition,
+)
+from .counters import author_scope, group_scope
+from . import latest
+from .stats import author_stats
+from .page_cache import INDEX, anonymous_page_cache
+from .page_cache import group_scope as group_page_scope
+from .page_cache import profile_scope
+from .search import search as search_posts
 from .utils import pagination
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from core.routers import replica_reads
 
 
+@replica_reads
+@index_condition
+@anonymous_page_cache(lambda: INDEX)
 def index(request):
-    posts = Post.objects.select_related('author', 'group')
-    page_obj = pagination(request, posts)
+    posts = Post.objects.for_feed()
+    # Первая страница берётся из буфера последних постов процесса
+    page_obj = pagination(request, posts, head=latest.head)
     title = 'Последние обновления на сайте'
     context = {
         'page_obj': page_obj,
@@ -17,10 +34,13 @@ def index(request):
 
 
 # View-функция для страницы сообщества:
+@replica_reads
+@group_condition
+@anonymous_page_cache(group_page_scope)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.select_related('author', 'group')
-    page_obj = pagination(request, posts)
+    posts = group.posts.for_feed()
+    page_obj = pagination(request, posts, scope=group_scope(group.pk))
     title = f'Записи сообщества {group.title}'
     description = group.description
     context = {
@@ -32,10 +52,16 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@replica_reads
+@profile_condition
+@anonymous_page_cache(profile_scope)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.select_related('author', 'group')
-    page_obj = pagination(request, posts)
+    author = get_object_or_404(
+        User.objects.select_related('stats'), username=username
+    )
+    author_stats(author)
+    posts = author.posts.for_feed()
+    page_obj = pagination(request, posts, scope=author_scope(author.pk))
     context = {
         'author': author,
         'page_obj': page_obj,
@@ -43,8 +69,25 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    posts = Post.objects.none()
+    if query:
+        posts = search_posts(Post.objects.for_feed(), query)
+    # Число найденных постов не кэшируется: у каждого запроса оно своё
+    page_obj = pagination(request, posts, scope=None)
+    context = {
+        'page_obj': page_obj,
+        'query': query,
+        'title': f'Поиск: {query}' if query else 'Поиск',
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@replica_reads
+@post_condition
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = load_post(post_id)
     context = {
         'post': post,
     }
@@ -52,6 +95,7 @@ def post_detail(request, post_id):
 
 
 @login_required
+@transaction.atomic
 def post_create(request):
     template = 'posts/create_post.html'
     form = PostForm(request.POST or None)
@@ -71,6 +115,7 @@ def post_create(request):
 
 
 @login_required
+@transaction.atomic
 def post_edit(request, post_id):
     template = 'posts/create_post.html'
     post = get_object_or_404(Post, pk=post_id)
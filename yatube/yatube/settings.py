@@ -46,6 +46,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,13 +58,20 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Сжатие ответов, см. core.middleware.CompressionMiddleware.
+# brotli используется, если установлен пакет brotli.
+COMPRESSION_MIN_SIZE = 200
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
 ROOT_URLCONF = 'yatube.urls'
 # Путь к директории с шаблонами вынесен в переменную:
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django-шаблоны с учётом времени отрисовки в метриках запроса
+        'BACKEND': 'core.template_backends.TimedDjangoTemplates',
         # Добавлено: Искать шаблоны на уровне проекта
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
@@ -90,6 +100,91 @@ DATABASES = {
     }
 }
 
+# Реплики для чтения лент, через запятую:
+# YATUBE_DB_REPLICAS=replica.sqlite3. Локально SQLite-реплику
+# обновляет команда sync_replicas. Тесты запускаются без реплик.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.environ.get('YATUBE_DB_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, name),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+# PRAGMA для каждого нового соединения с SQLite, см. core.db.
+# Профиль для продакшена — settings_production.
+SQLITE_PRAGMAS = {}
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Сколько секунд после записи пользователь читает с основной базы
+REPLICA_PIN_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+# Бэкенд выбирается переменной окружения YATUBE_CACHE_BACKEND:
+# locmem (LRU в памяти процесса, по умолчанию), file, redis
+# (нужен пакет django-redis и совместимый сервер) или dummy.
+# locmem у каждого процесса свой и годится только для одного процесса:
+# через версии в кэше процессы узнают о чужих изменениях постов
+# (например, буфер последних постов posts.latest).
+
+CACHE_BACKEND = os.environ.get('YATUBE_CACHE_BACKEND', 'locmem')
+# Бэкенды, общие для всех процессов
+SHARED_CACHE_BACKENDS = ('file', 'redis')
+# Псевдоним кэша: (номер базы redis, лимит записей)
+CACHE_ALIASES = {
+    'default': (0, 1000),
+    'pages': (1, 500),
+    'fragments': (2, 10000),
+    'counters': (3, 10000),
+}
+
+
+def cache_location(backend):
+    return os.environ.get(
+        'YATUBE_CACHE_LOCATION',
+        {
+            'file': os.path.join(BASE_DIR, '.cache'),
+            'redis': 'redis://127.0.0.1:6379',
+        }.get(backend, ''),
+    )
+
+
+def cache_config(backend, alias, redis_db, max_entries):
+    options = {'MAX_ENTRIES': max_entries}
+    if backend == 'file':
+        return {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(cache_location(backend), alias),
+            'OPTIONS': options,
+        }
+    if backend == 'redis':
+        return {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': f'{cache_location(backend)}/{redis_db}',
+        }
+    if backend == 'dummy':
+        return {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': alias,
+        'OPTIONS': options,
+    }
+
+
+def build_caches(backend):
+    return {
+        alias: cache_config(backend, alias, *params)
+        for alias, params in CACHE_ALIASES.items()
+    }
+
+
+CACHES = build_caches(CACHE_BACKEND)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -130,6 +225,8 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = os.path.join(BASE_DIR, 'static'),
+# Отдавать STATIC_ROOT из WSGI через core.static, см. settings_production
+SERVE_STATIC_FILES = False
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -139,3 +236,6 @@ LOGIN_REDIRECT_URL = 'posts:index'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 # указываем директорию, в которую будут складываться файлы писем
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Keyset-пагинация лент (?cursor=) вместо номеров страниц
+POSTS_CURSOR_PAGINATION = False
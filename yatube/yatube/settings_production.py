@@ -0,0 +1,61 @@
+"""Настройки для продакшена поверх settings.
+
+    DJANGO_SETTINGS_MODULE=yatube.settings_production
+"""
+import copy
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import (
+    BASE_DIR, DATABASES, SHARED_CACHE_BACKENDS, build_caches,
+)
+
+# Копия, чтобы не менять словарь модуля settings
+DATABASES = copy.deepcopy(DATABASES)
+
+DEBUG = False
+
+# Воркеров несколько, и об изменениях постов (кэши страниц и объектов,
+# буфер последних постов) они узнают через версии в общем кэше.
+# Кэш в памяти процесса здесь оставил бы их рассогласованными. На file
+# incr не атомарен, и буфер последних постов перечитывается после каждого
+# изменения; redis позволяет править его на месте.
+CACHE_BACKEND = os.environ.get('YATUBE_CACHE_BACKEND', 'file')
+if CACHE_BACKEND not in SHARED_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f'YATUBE_CACHE_BACKEND={CACHE_BACKEND} не общий для воркеров, '
+        f'нужен один из: {", ".join(SHARED_CACHE_BACKENDS)}.'
+    )
+CACHES = build_caches(CACHE_BACKEND)
+
+# Постоянные соединения вместо нового на каждый запрос. Соединение,
+# на котором были ошибки, Django закрывает в конце запроса и открывает
+# заново в следующем (close_if_unusable_or_obsolete).
+CONN_MAX_AGE = int(os.environ.get('YATUBE_CONN_MAX_AGE', 600))
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = CONN_MAX_AGE
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        # Сколько секунд ждать снятия блокировки записи
+        database.setdefault('OPTIONS', {})['timeout'] = 20
+
+SQLITE_PRAGMAS = {
+    # Читатели не блокируют писателя и наоборот
+    'journal_mode': 'WAL',
+    # В режиме WAL fsync только на контрольных точках
+    'synchronous': 'NORMAL',
+    # 64 МБ кэша страниц на соединение (отрицательное значение — в КиБ)
+    'cache_size': -64_000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Статика с хэшами в именах и сжатыми копиями (brotli — если установлен
+# пакет brotli) после manage.py collectstatic; её отдаёт WSGI-обработчик
+# из yatube.wsgi с Cache-Control immutable.
+STATIC_ROOT = os.environ.get(
+    'YATUBE_STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles')
+)
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+SERVE_STATIC_FILES = True
@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
+from core.static import PrecompressedStaticFiles
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+# Собранная статика отдаётся до Django (см. settings_production)
+if settings.SERVE_STATIC_FILES:
+    application = PrecompressedStaticFiles(
+        application, settings.STATIC_ROOT, settings.STATIC_URL
+    )